@@ -0,0 +1,67 @@
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from functools import lru_cache
+
+# --- Indian-numbering (lakh/crore) amount in words ---
+# Produces the same wording as num2words(n, lang='en_IN').title() for whole rupees,
+# without num2words in the keystroke path, and spells out paise instead of rounding
+# them away.
+
+ONES = ["Zero", "One", "Two", "Three", "Four", "Five", "Six", "Seven", "Eight", "Nine", "Ten",
+        "Eleven", "Twelve", "Thirteen", "Fourteen", "Fifteen", "Sixteen", "Seventeen", "Eighteen", "Nineteen"]
+TENS = ["", "", "Twenty", "Thirty", "Forty", "Fifty", "Sixty", "Seventy", "Eighty", "Ninety"]
+CRORE, LAKH, THOUSAND = 10_000_000, 100_000, 1_000
+WORDS_CACHE_SIZE = 4096
+
+
+def _below_hundred(n):
+    if n < 20:
+        return ONES[n]
+    tens, ones = divmod(n, 10)
+    return TENS[tens] + ("-" + ONES[ones] if ones else "")
+
+
+def _below_thousand(n):
+    hundreds, rest = divmod(n, 100)
+    if not hundreds:
+        return _below_hundred(rest)
+    words = ONES[hundreds] + " Hundred"
+    return words + " And " + _below_hundred(rest) if rest else words
+
+
+def indian_number_words(n):
+    """Whole number in Indian numbering, e.g. 1234567 -> 'Twelve Lakh, Thirty-Four Thousand, Five Hundred And Sixty-Seven'."""
+    if n < 0:
+        return "Minus " + indian_number_words(-n)
+    if n < 100:
+        return _below_hundred(n)
+    crores, n = divmod(n, CRORE)
+    lakhs, n = divmod(n, LAKH)
+    thousands, n = divmod(n, THOUSAND)
+    hundreds, rest = divmod(n, 100)
+    groups = []
+    if crores: groups.append(indian_number_words(crores) + " Crore")
+    if lakhs: groups.append(_below_hundred(lakhs) + " Lakh")
+    if thousands: groups.append(_below_hundred(thousands) + " Thousand")
+    if hundreds: groups.append(ONES[hundreds] + " Hundred")
+    words = ", ".join(groups)
+    return words + " And " + _below_hundred(rest) if rest else words
+
+
+@lru_cache(maxsize=WORDS_CACHE_SIZE)
+def _currency_words(rupees, paise):
+    if not paise:
+        return indian_number_words(rupees) + " Only"
+    if not rupees:
+        return _below_hundred(paise) + " Paise Only"
+    return indian_number_words(rupees) + " And " + _below_hundred(paise) + " Paise Only"
+
+
+def convert_to_indian_currency_words(amount):
+    try:
+        paise_total = int((Decimal(str(amount)) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+    except (InvalidOperation, ValueError):
+        return "Invalid Amount"
+    sign = -1 if paise_total < 0 else 1
+    rupees, paise = divmod(abs(paise_total), 100)
+    words = _currency_words(rupees, paise)
+    return "Minus " + words if sign < 0 else words
@@ -0,0 +1,168 @@
+"""Renders many invoices to PDF in parallel, without the GUI.
+
+Input is either JSONL (one invoice snapshot per line, see invoice_model) or CSV
+with one line item per row; consecutive CSV rows sharing an ``invoice_id`` form
+one invoice. An invoice that cannot be read or rendered is reported with its
+input line and skipped, as is one naming a company that is not in COMPANY_PROFILES
+or an output file outside --out-dir; the exit status is non-zero if any were. Usage:
+
+    python batch_invoices.py invoices.jsonl --out-dir reissued/ [--workers N]
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from billing_data import COMPANY_PROFILES, DEFAULT_COMPANY
+from invoice_model import BUYER_FIELDS, invoice_file_name
+from pdf_invoice import build_invoice_pdf
+
+ITEM_FIELDS = ("description", "size", "qty", "rate", "hsn", "gst_rate")
+BATCH_JOBS = 8
+
+
+# --- Input readers: (where, invoice or None, error or None) per invoice ---
+def read_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if line.strip():
+                try:
+                    yield f"line {line_no}", json.loads(line), None
+                except ValueError as e:
+                    yield f"line {line_no}", None, f"invalid JSON: {e}"
+
+
+def read_csv(path):
+    invoice, current_id, where = None, None, None
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for record in reader:
+            if invoice is None or record.get("invoice_id") != current_id:
+                if invoice is not None:
+                    yield where, invoice, None
+                current_id = record.get("invoice_id")
+                where = f"line {reader.line_num} (invoice_id {current_id})"
+                invoice = {
+                    "company": record.get("company") or DEFAULT_COMPANY,
+                    "date": record.get("date", ""),
+                    "buyer": {field: record.get(field, "") for field in BUYER_FIELDS},
+                    "items": [],
+                }
+            if record.get("description"):
+                invoice["items"].append({field: record.get(field, "") for field in ITEM_FIELDS})
+    if invoice is not None:
+        yield where, invoice, None
+
+
+def read_invoices(path):
+    return read_csv(path) if path.lower().endswith(".csv") else read_jsonl(path)
+
+
+# --- Rendering ---
+def render_batch(jobs):
+    """[(where, pdf_path, seconds, error or None)] for (where, data, pdf_path) jobs; runs in a worker process.
+
+    Errors are returned as text rather than raised, so one bad invoice cannot stop the batch.
+    """
+    results = []
+    for where, data, pdf_path in jobs:
+        start = time.perf_counter()
+        try:
+            build_invoice_pdf(data, pdf_path)
+            error = None
+        except Exception as e:
+            if os.path.exists(pdf_path): os.remove(pdf_path)
+            error = f"{type(e).__name__}: {e}"
+        results.append((where, pdf_path, time.perf_counter() - start, error))
+    return results
+
+
+def plan_jobs(invoices, out_dir):
+    """Yields (where, data, pdf_path, error), numbering same-buyer same-day duplicates; unreadable invoices keep their error."""
+    seen = {}
+    for where, data, error in invoices:
+        if error is None:
+            try:
+                name = data.get("output") or invoice_file_name(data)
+            except (AttributeError, KeyError, TypeError) as e:
+                error = f"not an invoice snapshot: {type(e).__name__}: {e}"
+            else:
+                # A tax invoice must never go out under the default company's name and GSTIN
+                if data.get("company") and data["company"] not in COMPANY_PROFILES:
+                    error = f"unknown company {data['company']!r}"
+                elif not isinstance(name, str) or name in (".", "..") or os.path.basename(name) != name:
+                    error = f"output must be a file name within the output directory, not {name!r}"
+        if error is not None:
+            yield where, None, None, error
+            continue
+        count = seen.get(name, 0)
+        seen[name] = count + 1
+        if count:
+            stem, ext = os.path.splitext(name)
+            name = f"{stem}_{count + 1}{ext}"
+        yield where, data, os.path.join(out_dir, name), None
+
+
+def iter_batches(planned, failures, size=BATCH_JOBS):
+    """Groups renderable jobs into batches, collecting the invoices that could not be planned into failures."""
+    batch = []
+    for where, data, pdf_path, error in planned:
+        if error is not None:
+            failures.append((where, error))
+            continue
+        batch.append((where, data, pdf_path))
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def run_batch(input_path, out_dir, workers=None, quiet=False):
+    """Renders every invoice in input_path; returns (rendered, [(where, error)] for those that failed)."""
+    os.makedirs(out_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    rendered, failures = 0, []
+    batches = iter_batches(plan_jobs(read_invoices(input_path), out_dir), failures)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        while True:
+            for batch in batches:
+                pending.add(pool.submit(render_batch, batch))
+                if len(pending) >= workers * 4:
+                    break
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for where, pdf_path, seconds, error in future.result():
+                    if error is not None:
+                        failures.append((where, error))
+                        continue
+                    rendered += 1
+                    if not quiet:
+                        print(f"{seconds * 1000:8.1f} ms  {pdf_path}")
+    elapsed = time.perf_counter() - start
+    rate = rendered / elapsed if elapsed else 0.0
+    for where, error in failures:
+        print(f"Failed {input_path} {where}: {error}", file=sys.stderr)
+    print(f"Rendered {rendered} invoices in {elapsed:.2f}s with {workers} workers ({rate:.1f} invoices/s), {len(failures)} failed")
+    return rendered, failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render invoices from a CSV/JSONL file to PDF in parallel.")
+    parser.add_argument("input", help="JSONL (one invoice per line) or CSV (one line item per row) file")
+    parser.add_argument("--out-dir", default="invoices", help="directory for the generated PDFs")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--quiet", action="store_true", help="only print the summary line")
+    args = parser.parse_args(argv)
+    _, failures = run_batch(args.input, args.out_dir, args.workers, args.quiet)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
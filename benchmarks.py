@@ -0,0 +1,572 @@
+"""Micro-benchmarks for the billing hot paths.
+
+    python benchmarks.py templates [--sizes 10 100 1000] [--repeat 5]
+    python benchmarks.py words [--samples 200000]
+    python benchmarks.py gst [--invoices 20000]
+    python benchmarks.py gstr1 [--invoices 300000]
+    python benchmarks.py pages [--sizes 100 1000 5000 10000]
+    python benchmarks.py legacy [--files 100000]
+    python benchmarks.py journal [--lines 1000]
+    python benchmarks.py bulk [--sizes 400 2000 5000]
+    python benchmarks.py numbering [--processes 8] [--invoices 250] [--shared]
+    python benchmarks.py pdfcache [--sizes 10 100 1000]
+    python benchmarks.py service [--clients 64] [--seconds 10] [--url http://127.0.0.1:8765]
+"""
+import argparse
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+SAMPLE_PRODUCTS = ['Tshirt', 'Tshirt H/S, Lower', 'Tshirt F/S, Lower', 'Kurta, Lower', 'Sweater', 'Lower', 'TrackSuit', 'Socks', 'Tie']
+SAMPLE_SIZES = ["S", "M", "L", "XL", "XXL", "28", "30", "32", "34", "36"]
+
+
+def sample_invoice(lines, seed=0):
+    rng = random.Random(seed)
+    return {
+        "company": "MODERN KNITWEARS",
+        "date": "01/04/2026",
+        "buyer": {"name": "Benchmark Traders", "address": "Main Bazar, Kathua", "gstin": "01ABCDE1234F1Z5",
+                  "state": "Jammu and Kashmir", "state_code": "01", "vehicle_no": "JK08A1234",
+                  "transport_mode": "Road Transport", "driver_name": "Driver"},
+        "items": [{"description": rng.choice(SAMPLE_PRODUCTS), "size": rng.choice(SAMPLE_SIZES),
+                   "qty": str(rng.randint(1, 50)), "rate": f"{rng.randint(50, 900)}.{rng.randint(0, 99):02d}"}
+                  for _ in range(lines)],
+    }
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+# --- PDF template cache ---
+def bench_templates(args):
+    from pdf_invoice import build_invoice_pdf, get_template
+
+    def render_cold(data):
+        get_template.cache_clear()
+        build_invoice_pdf(data, io.BytesIO())
+
+    def render_warm(data):
+        build_invoice_pdf(data, io.BytesIO())
+
+    print(f"{'lines':>6} {'uncached ms':>12} {'cached ms':>10} {'saved':>7}")
+    for lines in args.sizes:
+        data = sample_invoice(lines)
+        cold = best_of(args.repeat, lambda: render_cold(data))
+        get_template(data["company"])
+        warm = best_of(args.repeat, lambda: render_warm(data))
+        print(f"{lines:>6} {cold * 1000:>12.2f} {warm * 1000:>10.2f} {(cold - warm) / cold:>7.1%}")
+
+
+# --- Multi-page item tables ---
+def bench_pages(args):
+    import tracemalloc
+    from reportlab.platypus import SimpleDocTemplate, Table
+    from pdf_invoice import ITEM_COLUMN_WIDTHS, ITEM_HEADER, ItemRowsFlowable, build_invoice_pdf, get_template
+
+    def items_only(rows, amounts, chunked):
+        template = get_template("MODERN KNITWEARS")
+        if chunked:
+            flowable = ItemRowsFlowable(template, rows, amounts)
+        else:
+            flowable = Table([ITEM_HEADER] + rows, colWidths=ITEM_COLUMN_WIDTHS); flowable.setStyle(template.items_table_style)
+        SimpleDocTemplate(io.BytesIO(), rightMargin=30, leftMargin=30, topMargin=30, bottomMargin=30).build([flowable])
+
+    print(f"{'lines':>6} {'invoice ms':>11} {'us/line':>8} {'peak MB':>8} {'items ms':>9} {'one-table ms':>13}")
+    for lines in args.sizes:
+        data = sample_invoice(lines)
+        total = best_of(args.repeat, lambda: build_invoice_pdf(data, io.BytesIO()))
+        tracemalloc.start()
+        build_invoice_pdf(data, io.BytesIO())
+        peak = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+        rows = [[str(i + 1), entry["description"], entry["size"], entry["qty"], entry["rate"], "1.00"] for i, entry in enumerate(data["items"])]
+        amounts = [1] * lines
+        chunked = best_of(args.repeat, lambda: items_only(rows, amounts, True))
+        single = f"{best_of(args.repeat, lambda: items_only(rows, amounts, False)) * 1000:13.1f}" if lines <= args.one_table_max else f"{'-':>13}"
+        print(f"{lines:>6} {total * 1000:>11.1f} {total / lines * 1e6:>8.1f} {peak:>8.1f} {chunked * 1000:>9.1f} {single}")
+
+
+# --- Legacy text invoice import ---
+def legacy_text(data):
+    """An invoice in the layout myfile.py's save_to_file writes."""
+    from invoice_model import invoice_from_data
+    buyer, invoice = data["buyer"], invoice_from_data(data)
+    totals = invoice.totals()
+    out = [f"GSTIN.  : 01AAAFM1234K1Z5   \t\tTAX INVOICE \t\t Mob  : 94192-48547\n", "\n", "\t\t\t\tMODERN KNITWEARS\n",
+           "\tVill Chack Khooni, Near Industrial Estate, SICOP Kathua (J&K)\n", f"\t\t\t\t\t\t\tDated : {data['date']}\n",
+           f"Buyer's Name  : {buyer['name']}\n", f"Address  : {buyer['address']}\n", "-" * 60 + "\n",
+           f"GSTIN/Unique ID  : {buyer['gstin']}    State  : {buyer['state']}    State Code  : {buyer['state_code']}\n",
+           f"Vehicle No  : {buyer['vehicle_no']}    Mode of Transport  : {buyer['transport_mode']}    Driver Name  : {buyer['driver_name']}\n",
+           "-" * 60 + "\n", f"{'S.No':<5} {'Description of Goods':<30} {'Quantity':<10} {'Rate':<10} {'Amount':<15}\n", "-" * 60 + "\n"]
+    for s_no, (entry, item) in enumerate(zip(data["items"], invoice.items), 1):
+        out.append(f"{s_no:<5} {entry['description']:<30} {entry['qty']:<10} {entry['rate']:<10} {f'{item.amount:.2f}':<15}\n")
+    out += ["\n", f"Total Amount (Before Tax) : {totals['total_before_tax']:.2f}\n", f"CGST @ 2.5%                 : {totals['cgst']:.2f}\n",
+            f"SGST @ 2.5%                 : {totals['sgst']:.2f}\n", f"IGST @ 0%                     : {totals['igst']:.2f}\n",
+            f"Grand Total  : {totals['grand_total']:.2f}\n", "Invoice Amount in Words: one thousand\n"]
+    return "".join(out)
+
+
+def bench_legacy(args):
+    import json
+    from legacy_import import run_import
+    rng = random.Random(4)
+    templates = [legacy_text(sample_invoice(rng.randint(1, 25), seed)) for seed in range(200)]
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "txt")
+        broken = 0
+        for i in range(args.files):
+            folder = os.path.join(src, f"{i // 1000:03d}")
+            if i % 1000 == 0: os.makedirs(folder)
+            text = templates[i % len(templates)]
+            if i % 97 == 0:  # truncated or hand-edited files
+                text = text[:len(text) // 2] if i % 2 else text.replace("Total Amount (Before Tax) : ", "Total Amount (Before Tax) : 1")
+                broken += 1
+            with open(os.path.join(folder, f"Invoice_{i}.txt"), "w") as f:
+                f.write(text)
+        out = os.path.join(tmp, "legacy.jsonl")
+        imported, failed = run_import([src], out, os.path.join(tmp, "errors.csv"), workers=args.workers)
+        with open(out, encoding="utf-8") as f:
+            first = json.loads(f.readline())
+    print(f"{failed} of {broken} damaged files reported; first import has {len(first['items'])} items")
+    return 0 if failed == broken and imported == args.files - broken else 1
+
+
+# --- Draft journal ---
+def bench_journal(args):
+    from types import SimpleNamespace
+    from draft_journal import DraftJournal
+    from invoice_model import invoice_from_data
+    rng = random.Random(5)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "draft.journal")
+        journal, rows, flushes = DraftJournal(path), [], []
+        journal.start([], {"company": "MODERN KNITWEARS", "date": "01/04/2026"})
+
+        def tick():  # the autosave timer, roughly once a second of typing
+            start = time.perf_counter(); journal.flush(); flushes.append(time.perf_counter() - start)
+
+        def typed(row, field, text):  # one op per keystroke, as the debounced recalculation sees them
+            for end in range(1, len(text) + 1):
+                setattr(row, field, text[:end]); journal.update_row(row)
+                if len(journal.pending) >= 20: tick()
+
+        journal.update_form(sample_invoice(0)["buyer"])
+        for i in range(args.lines):
+            row = SimpleNamespace(description="", size="", qty="", rate="", hsn="", gst_rate="5")
+            rows.append(row); journal.add_row(row)
+            row.description, row.size = rng.choice(SAMPLE_PRODUCTS), rng.choice(SAMPLE_SIZES); journal.update_row(row)
+            typed(row, "qty", str(rng.randint(1, 50)))
+            typed(row, "rate", f"{rng.randint(50, 900)}.{rng.randint(0, 99):02d}")
+            if i % 10 == 9:  # go back and correct an earlier line
+                typed(rows[-5], "qty", str(rng.randint(1, 50)))
+            if i % 25 == 24:
+                journal.delete_row(rows.pop(rng.randrange(len(rows))))
+        tick()
+        ops, size = journal.ops_on_disk, os.path.getsize(path)
+        replay = best_of(args.repeat, lambda: DraftJournal.read(path))
+        draft, replayed_ops = DraftJournal.read(path)
+        rebuild = best_of(args.repeat, lambda: invoice_from_data({"items": draft.items()}))
+        ok = replayed_ops == ops and list(draft.rows) == [row.draft_id for row in rows]
+        compact = best_of(1, journal.compact)
+        compact_size = os.path.getsize(path)
+        replay_compacted = best_of(args.repeat, lambda: DraftJournal.read(path))
+        ok = ok and DraftJournal.read(path)[0].rows == draft.rows
+        # A crash mid-write leaves a torn last line; replay keeps everything before it
+        journal.update_form({"driver_name": "Torn"}); journal.flush()
+        with open(path, "r+b") as f: f.truncate(os.path.getsize(path) - 5)
+        torn, torn_ops = DraftJournal.read(path)
+        ok = ok and torn_ops == 1 and torn.rows == draft.rows and torn.form["driver_name"] != "Torn"
+    flush_ms = sorted(t * 1000 for t in flushes)
+    print(f"{len(rows)} lines, {ops} ops in {len(flushes)} flushes: {size / 1024:.0f} KiB")
+    print(f"flush (write + fsync): mean {sum(flush_ms) / len(flush_ms):.2f} ms, p99 {flush_ms[int(len(flush_ms) * 0.99)]:.2f} ms")
+    print(f"replay {ops} ops:        {replay * 1000:8.1f} ms")
+    print(f"rebuild invoice model: {rebuild * 1000:8.1f} ms")
+    print(f"compact:               {compact * 1000:8.1f} ms -> {compact_size / 1024:.0f} KiB")
+    print(f"replay after compact:  {replay_compacted * 1000:8.1f} ms")
+    return 0 if ok else 1
+
+
+# --- Bulk paste and clear of line items ---
+def bench_bulk(args):
+    """Model-side cost of pasting and clearing n rows: per row with a totals refresh each, as
+    typing/Add Row and the old reset_items did, vs one batch as paste and Reset Items do now."""
+    from amount_words import convert_to_indian_currency_words
+    from invoice_model import Invoice, snapshot_lines
+    from item_import import parse_items
+    print(f"{'lines':>6} {'paste per row':>14} {'paste batch':>12} {'clear per row':>14} {'clear batch':>12}")
+    for n in args.sizes:
+        data = sample_invoice(n, seed=n)
+        text = "Description\tSize\tQty\tRate\n" + "".join(f"{e['description']}\t{e['size']}\t{e['qty']}\t{e['rate']}\n" for e in data["items"])
+
+        def fresh():
+            invoice = Invoice()
+            invoice.subscribe(lambda inv: convert_to_indian_currency_words(inv.totals()["grand_total"]))  # calculate_total
+            return invoice
+
+        def paste_per_row():
+            invoice = fresh()
+            for line in snapshot_lines(parse_items(text)):
+                item = invoice.add_item()
+                invoice.update_item(item, description=line[0], size=line[1], qty=line[2], rate=line[3])
+            return invoice
+
+        def clear_per_row(invoice):
+            rows = list(invoice.items)
+            for item in list(rows):
+                rows.remove(item); invoice.remove_item(item)
+
+        per_row = best_of(args.repeat, paste_per_row)
+        batch = best_of(args.repeat, lambda: fresh().add_items(snapshot_lines(parse_items(text))))
+        invoices = [paste_per_row() for _ in range(args.repeat)]
+        clear_slow = best_of(args.repeat, lambda: clear_per_row(invoices.pop()))
+        invoices = [paste_per_row() for _ in range(args.repeat)]
+        clear_fast = best_of(args.repeat, lambda: invoices.pop().clear())
+        print(f"{n:>6} {per_row * 1000:>11.1f} ms {batch * 1000:>9.1f} ms {clear_slow * 1000:>11.1f} ms {clear_fast * 1000:>9.2f} ms")
+    return 0
+
+
+# --- Invoice numbering from several counters at once ---
+NUMBERING_DATES = ["30/03/2026", "31/03/2026", "01/04/2026", "02/04/2026"]  # straddles a financial year
+
+
+def numbering_worker(path, shared, worker, count, start_at):
+    """Saves count small invoices as one billing counter would; returns (invoice_no, company, date) per save."""
+    from billing_data import COMPANY_PROFILES
+    from invoice_store import InvoiceStore
+    companies, issued = list(COMPANY_PROFILES), []
+    data = sample_invoice(3, seed=worker)
+    store = InvoiceStore(path, shared=shared)
+    time.sleep(max(0.0, start_at - time.time()))  # all counters start together
+    for i in range(count):
+        data["company"], data["date"] = companies[(worker + i) % len(companies)], NUMBERING_DATES[i % len(NUMBERING_DATES)]
+        issued.append((store.save(data), data["company"], data["date"]))
+    store.close()
+    return issued, time.time()
+
+
+def bench_numbering(args):
+    from collections import defaultdict
+    from concurrent.futures import ProcessPoolExecutor
+    from invoice_store import InvoiceStore, financial_year, parse_invoice_date
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "shared.db")
+        InvoiceStore(path, shared=args.shared).close()
+        start_at = time.time() + 1.0
+        with ProcessPoolExecutor(args.processes) as pool:
+            futures = [pool.submit(numbering_worker, path, args.shared, worker, args.invoices, start_at) for worker in range(args.processes)]
+            results = [future.result() for future in futures]
+        elapsed = max(finished for _, finished in results) - start_at
+        with InvoiceStore(path, shared=args.shared) as store:
+            stored = store.conn.execute("SELECT count(*) FROM invoices").fetchone()[0]
+    issued = [entry for batch, _ in results for entry in batch]
+    numbers = [invoice_no for invoice_no, _, _ in issued]
+    seqs = defaultdict(list)
+    for invoice_no, company, invoice_date in issued:
+        seqs[company, financial_year(parse_invoice_date(invoice_date))].append(int(invoice_no.rsplit("/", 1)[1]))
+    duplicates = len(numbers) - len(set(numbers))
+    gaps = sum(sorted(found) != list(range(1, len(found) + 1)) for found in seqs.values())
+    mode = "shared (rollback journal)" if args.shared else "local (WAL)"
+    print(f"{len(numbers)} invoices from {args.processes} processes, {mode}: {elapsed:.2f} s, {len(numbers) / elapsed:,.0f} allocations/s")
+    print(f"{len(seqs)} company/financial-year sequences, {duplicates} duplicate numbers, {gaps} sequences with gaps, {stored} rows stored")
+    return 0 if not duplicates and not gaps and stored == len(numbers) else 1
+
+
+# --- PDF cache ---
+def bench_pdfcache(args):
+    from pdf_cache import PdfCache
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = PdfCache(os.path.join(tmp, "cache"), max_bytes=1 << 30)
+        print(f"{'lines':>6} {'render':>10} {'reprint':>10}")
+        for lines in args.sizes:
+            data = sample_invoice(lines, seed=lines)
+            data["invoice_no"] = f"MK/2026-27/{lines:05d}"
+            start = time.perf_counter(); path = cache.render(data); cold = time.perf_counter() - start
+            hit = best_of(args.repeat, lambda: cache.render(data))
+            ok = ok and cache.render(data) == path
+            print(f"{lines:>6} {cold * 1000:>7.1f} ms {hit * 1000:>7.3f} ms")
+        # Same buyer and date, different goods: separate files. Same content spelled differently: one file.
+        data = sample_invoice(5, seed=1)
+        other = sample_invoice(5, seed=2)
+        same = dict(reversed(list(data.items())), source="legacy.txt", items=[dict(entry, gst_rate="5.00", hsn="6109") for entry in data["items"]])
+        ok = ok and cache.path_for(data) != cache.path_for(other) and cache.path_for(data) == cache.path_for(same)
+        # LRU: with room for about ten invoices, the one reprinted in between survives
+        small = PdfCache(os.path.join(tmp, "small"), max_bytes=0)
+        size = os.path.getsize(small.render(sample_invoice(5, seed=0)))
+        small.max_bytes = size * 10
+        kept = sample_invoice(5, seed=1)
+        small.render(kept)
+        for seed in range(2, 40):
+            time.sleep(0.002)  # distinct mtimes on coarse filesystem clocks
+            small.render(sample_invoice(5, seed=seed))
+            if seed % 5 == 0: small.render(kept)
+        files = [entry for entry in os.scandir(small.directory)]
+        used = sum(entry.stat().st_size for entry in files)
+        survived = os.path.exists(small.path_for(kept))
+        print(f"LRU: {len(files)} files / {used / 1024:.0f} KiB kept under a {small.max_bytes / 1024:.0f} KiB limit, reprinted invoice kept: {survived}")
+        ok = ok and survived and used <= small.max_bytes
+    return 0 if ok else 1
+
+
+# --- Billing service load test ---
+SERVICE_MIX = [("POST", "/totals")] * 14 + [("POST", "/invoices")] * 5 + [("POST", "/pdf")]  # mostly POS price checks
+
+
+async def service_client(host, port, deadline, bodies, latencies, failures, rng):
+    import asyncio
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            method, path = rng.choice(SERVICE_MIX)
+            body = rng.choice(bodies)
+            start = time.perf_counter()
+            writer.write(f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = int(next(line.split(b":")[1] for line in head.split(b"\r\n") if line.lower().startswith(b"content-length")))
+            await reader.readexactly(length)
+            latencies.setdefault(path, []).append(time.perf_counter() - start)
+            if not head.startswith(b"HTTP/1.1 200"): failures.append((path, head.split(b"\r\n")[0].decode()))
+    finally:
+        writer.close()
+
+
+def bench_service(args):
+    import asyncio
+    import json
+    import socket
+    import subprocess
+    from urllib.parse import urlsplit
+    rng = random.Random(6)
+    bodies = []
+    for seed in range(200):
+        data = sample_invoice(rng.randint(1, 30), seed)
+        data["buyer"]["state_code"] = ""  # filled in by the service from the state name
+        data["date"] = f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/2026"
+        bodies.append(json.dumps(data).encode())
+    server, tmp = None, tempfile.TemporaryDirectory()
+    if args.url:
+        host, port = urlsplit(args.url).hostname, urlsplit(args.url).port
+    else:
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0)); host, port = sock.getsockname()
+        env = dict(os.environ, BILLING_PDF_CACHE=os.path.join(tmp.name, "pdf-cache"))
+        command = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "billing_service.py"),
+                   "--port", str(port), "--db", os.path.join(tmp.name, "service.db")] + (["--workers", str(args.workers)] if args.workers else [])
+        server = subprocess.Popen(command, env=env, stdout=subprocess.PIPE, text=True)
+        print(server.stdout.readline().strip())
+    latencies, failures = {}, []
+
+    async def run():
+        deadline = time.perf_counter() + args.seconds
+        await asyncio.gather(*(service_client(host, port, deadline, bodies, latencies, failures, random.Random(client)) for client in range(args.clients)))
+
+    try:
+        start = time.perf_counter()
+        asyncio.run(run())
+        elapsed = time.perf_counter() - start
+    finally:
+        if server:
+            server.terminate(); server.wait()
+        tmp.cleanup()
+    total = sum(len(times) for times in latencies.values())
+    print(f"{total} requests from {args.clients} clients in {elapsed:.1f} s: {total / elapsed:,.0f} requests/s, {len(failures)} failed")
+    print(f"{'endpoint':<12} {'requests':>9} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for path, times in sorted(latencies.items()):
+        times.sort()
+        print(f"{path:<12} {len(times):>9} {len(times) / elapsed:>8,.0f} {times[len(times) // 2] * 1000:>8.1f} "
+              f"{times[min(len(times) - 1, int(len(times) * 0.99))] * 1000:>8.1f} {times[-1] * 1000:>8.1f}")
+    for path, status in failures[:5]: print(f"  {path}: {status}")
+    return 0 if total and not failures else 1
+
+
+# --- Amount in words ---
+def words_sample(count, seed=0):
+    """Random whole amounts across every digit length num2words' en_IN supports, plus edge cases."""
+    rng = random.Random(seed)
+    edges = [0, 1, 9, 10, 19, 20, 99, 100, 101, 110, 999, 1000, 1001, 1010, 1100, 99999, 100000, 100001, 100100,
+             101000, 999999, 1000000, 9999999, 10000000, 10000001, 10000100, 10100000, 100000000, 1230000000, 9999999999]
+    return edges + [rng.randrange(10 ** rng.randint(1, 10)) for _ in range(count)]
+
+
+def bench_words(args):
+    from num2words import num2words
+    from amount_words import _currency_words, convert_to_indian_currency_words
+
+    def legacy(amount):
+        return num2words(int(round(amount)), lang='en_IN').title() + " Only"
+
+    amounts = words_sample(args.samples)
+    mismatches = [n for n in amounts if convert_to_indian_currency_words(n) != legacy(n)]
+    for n in mismatches[:10]:
+        print(f"MISMATCH {n}: {convert_to_indian_currency_words(n)!r} != {legacy(n)!r}")
+    print(f"Conformance: {len(amounts) - len(mismatches)}/{len(amounts)} whole amounts identical to num2words")
+
+    rng = random.Random(1)
+    keystrokes = [rng.randrange(10 ** 7) for _ in range(20000)]
+    old = best_of(args.repeat, lambda: [legacy(n) for n in keystrokes])
+    _currency_words.cache_clear()
+    cold = best_of(1, lambda: [convert_to_indian_currency_words(n) for n in keystrokes])
+    repeated = keystrokes[:500] * 40
+    warm = best_of(args.repeat, lambda: [convert_to_indian_currency_words(n) for n in repeated])
+    per_call = lambda seconds, calls: seconds / calls * 1e6
+    print(f"num2words:             {per_call(old, len(keystrokes)):7.2f} us/call")
+    print(f"converter (uncached):  {per_call(cold, len(keystrokes)):7.2f} us/call")
+    print(f"converter (cache hit): {per_call(warm, len(repeated)):7.2f} us/call")
+    return 1 if mismatches else 0
+
+
+# --- GST engine ---
+def bench_gst(args):
+    from decimal import Decimal
+    from gst import compute_gst, compute_gst_many, rate_basis_points
+    rng = random.Random(2)
+    slabs = [Decimal(5), Decimal(12), Decimal(18)]
+    invoices = [[(rng.randint(-500, 5_000_000), rng.choice(slabs)) for _ in range(rng.randint(1, 40))] for _ in range(args.invoices)]
+    interstate = [rng.random() < 0.3 for _ in invoices]
+
+    def scalar():
+        results = []
+        for lines, inter in zip(invoices, interstate):
+            buckets = {}
+            for paise, rate in lines:
+                buckets[rate] = buckets.get(rate, Decimal(0)) + Decimal(paise) / 100
+            results.append(compute_gst(buckets, inter))
+        return results
+
+    index = [i for i, lines in enumerate(invoices) for _ in lines]
+    amounts = [paise for lines in invoices for paise, _ in lines]
+    rates = [rate_basis_points(rate) for lines in invoices for _, rate in lines]
+    vector = lambda: compute_gst_many(index, amounts, rates, interstate)
+
+    expected, got = scalar(), vector()
+    slab_invoice, _, taxable, cgst, sgst, igst = got
+    per_invoice = {}
+    for i, t, c, s_, g in zip(slab_invoice.tolist(), taxable.tolist(), cgst.tolist(), sgst.tolist(), igst.tolist()):
+        acc = per_invoice.setdefault(i, [0, 0, 0, 0])
+        for k, v in enumerate((t, c, s_, g)): acc[k] += v
+    mismatches = sum(1 for i, totals in enumerate(expected)
+                     if [int(totals[key] * 100) for key in ("total_before_tax", "cgst", "sgst", "igst")] != per_invoice.get(i, [0, 0, 0, 0]))
+    print(f"Conformance: {len(expected) - mismatches}/{len(expected)} invoices identical between scalar and vectorized engines")
+    lines = len(amounts)
+    old = best_of(args.repeat, scalar)
+    new = best_of(args.repeat, vector)
+    print(f"scalar compute_gst:      {old * 1000:8.1f} ms for {len(invoices)} invoices / {lines} lines")
+    print(f"vectorized (NumPy):      {new * 1000:8.1f} ms")
+    return 1 if mismatches else 0
+
+
+# --- GSTR-1 report ---
+def bench_gstr1(args):
+    from datetime import date, timedelta
+    from gstr1_report import build_summary
+    from invoice_store import InvoiceStore, to_paise
+    rng = random.Random(3)
+    gstins = [f"{rng.choice(['01', '01', '07', '27'])}ABCDE{i:04d}F1Z5" for i in range(2000)]
+    with tempfile.TemporaryDirectory() as tmp:
+        # Conformance: report totals against the per-invoice totals save() stored
+        with InvoiceStore(os.path.join(tmp, "check.db")) as store:
+            for seed in range(500):
+                data = sample_invoice(rng.randint(1, 30), seed)
+                gstin = rng.choice(gstins + [""] * 1000)
+                data["buyer"].update(gstin=gstin, state_code=gstin[:2] or rng.choice(["01", "07", ""]))
+                for item in data["items"]: item["gst_rate"] = rng.choice(["5", "12", "18"])
+                store.save(data)
+            expected = store.conn.execute("SELECT SUM(total_before_tax), SUM(cgst), SUM(sgst), SUM(igst) FROM invoices").fetchone()
+            got = build_summary(store.conn, "2026-04-01", "2027-03-31").totals()
+        print(f"Conformance: report totals {'match' if list(expected) == got else 'DIFFER from'} stored invoice totals")
+
+        # Timing: a year of invoices bulk-loaded straight into the tables (save() would take minutes)
+        store = InvoiceStore(os.path.join(tmp, "year.db"))
+        invoices, items, day = [], [], date(2026, 4, 1)
+        for i in range(1, args.invoices + 1):
+            gstin = rng.choice(gstins) if rng.random() < 0.6 else ""
+            iso = (day + timedelta(days=i * 365 // args.invoices)).isoformat()
+            invoices.append((i, f"MK/2026-27/{i:06d}", "MODERN KNITWEARS", "2026-27", i, iso, f"Buyer {gstin}", gstin,
+                             gstin[:2] or rng.choice(["01", "07", ""]), 0, 0, 0, 0, rng.randint(100, 20_000_000), ""))
+            items.extend((i, n, "Tshirt", "M", "1", "1", rng.choice(["5", "12", "18"]), to_paise(rng.randint(50, 50000)))
+                         for n in range(1, rng.randint(1, args.lines) + 1))
+        with store.conn:
+            store.conn.execute("BEGIN")
+            store.conn.executemany("INSERT INTO invoices (id, invoice_no, company, financial_year, seq, invoice_date, buyer_name, buyer_gstin, "
+                                   "buyer_state_code, total_before_tax, cgst, sgst, igst, grand_total, created_at) "
+                                   "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", invoices)
+            store.conn.executemany("INSERT INTO invoice_items (invoice_id, line_no, description, size, qty, rate, gst_rate, amount) "
+                                   "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", items)
+        lines = len(items)
+        del invoices, items
+        year = best_of(args.repeat, lambda: build_summary(store.conn, "2026-04-01", "2027-03-31"))
+        month = best_of(args.repeat, lambda: build_summary(store.conn, "2026-10-01", "2026-10-31"))
+        store.close()
+    print(f"year:  {year:6.2f} s for {args.invoices} invoices / {lines} lines ({lines / year:,.0f} lines/s)")
+    print(f"month: {month:6.2f} s")
+    return 0 if list(expected) == got else 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Billing app micro-benchmarks")
+    sub = parser.add_subparsers(dest="bench", required=True)
+    p = sub.add_parser("templates", help="per-invoice PDF render time with and without the template cache")
+    p.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    p.add_argument("--repeat", type=int, default=5)
+    p.set_defaults(func=bench_templates)
+    p = sub.add_parser("words", help="amount-in-words conformance against num2words and speed")
+    p.add_argument("--samples", type=int, default=200000)
+    p.add_argument("--repeat", type=int, default=3)
+    p.set_defaults(func=bench_words)
+    p = sub.add_parser("gst", help="scalar vs vectorized GST engine over many invoices")
+    p.add_argument("--invoices", type=int, default=20000)
+    p.add_argument("--repeat", type=int, default=3)
+    p.set_defaults(func=bench_gst)
+    p = sub.add_parser("pages", help="render time and memory of long multi-page invoices")
+    p.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000, 10000])
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--one-table-max", type=int, default=5000, help="largest size to also time as one unchunked table")
+    p.set_defaults(func=bench_pages)
+    p = sub.add_parser("legacy", help="parallel import of save_to_file text invoices")
+    p.add_argument("--files", type=int, default=100000)
+    p.add_argument("--workers", type=int, default=None)
+    p.set_defaults(func=bench_legacy)
+    p = sub.add_parser("journal", help="draft journal autosave cost and crash recovery time")
+    p.add_argument("--lines", type=int, default=1000)
+    p.add_argument("--repeat", type=int, default=5)
+    p.set_defaults(func=bench_journal)
+    p = sub.add_parser("bulk", help="pasting and clearing many rows per row vs in one batch")
+    p.add_argument("--sizes", type=int, nargs="+", default=[400, 2000, 5000])
+    p.add_argument("--repeat", type=int, default=3)
+    p.set_defaults(func=bench_bulk)
+    p = sub.add_parser("numbering", help="concurrent invoice number allocation from several processes")
+    p.add_argument("--processes", type=int, default=8)
+    p.add_argument("--invoices", type=int, default=250, help="invoices saved by each process")
+    p.add_argument("--shared", action="store_true", help="use the shared-folder store mode")
+    p.set_defaults(func=bench_numbering)
+    p = sub.add_parser("pdfcache", help="first render vs cached reprint, and LRU eviction")
+    p.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    p.add_argument("--repeat", type=int, default=20)
+    p.set_defaults(func=bench_pdfcache)
+    p = sub.add_parser("service", help="load test of the billing service: throughput and p99 latency")
+    p.add_argument("--clients", type=int, default=64, help="concurrent keep-alive connections")
+    p.add_argument("--seconds", type=float, default=10)
+    p.add_argument("--workers", type=int, default=None, help="PDF workers of the service started for the test")
+    p.add_argument("--url", default=None, help="test an already running service instead of starting one")
+    p.set_defaults(func=bench_service)
+    p = sub.add_parser("gstr1", help="GSTR-1 report over a year of stored invoices")
+    p.add_argument("--invoices", type=int, default=300000)
+    p.add_argument("--lines", type=int, default=15, help="maximum lines per invoice")
+    p.add_argument("--repeat", type=int, default=1)
+    p.set_defaults(func=bench_gstr1)
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+# --- Data structure for company profiles ---
+DEFAULT_COMPANY = "MODERN KNITWEARS"
+
+COMPANY_PROFILES = {
+    "MODERN KNITWEARS": {
+        "name": "MODERN KNITWEARS",
+        "address": "Vill Chack Khooni, Near Industrial Estate, SICOP Kathua (J&K)",
+        "gstin": "01AHQPR3836G2Z7",
+        "phone": "94192-48547,78898-77979"
+    },
+    "MODERN WOOLEN HOSIERY": {
+        "name": "MODERN WOOLEN HOSIERY",
+        "address": "Vill Chack Khooni, Near Industrial Estate, SICOP Kathua (J&K)",
+        "gstin": "01AHQPR3836G1Z8",
+        "phone": "94192-48547,78898-77979"
+    },
+    "DIYA GARMENTS": {
+        "name": "DIYA GARMENTS",
+        "address": "Vill Chack Khooni, Near Industrial Estate, SICOP Kathua (J&K)",
+        "gstin": "01FAEPK4495Q1Z6", # Example GSTIN
+        "phone": "94192-48547"
+    }
+}
+
+
+# --- MODIFIED: Data with Numerical State Codes (TIN numbers) as per user request ---
+STATE_CODES = {
+    "Andaman and Nicobar Islands": "35",
+    "Andhra Pradesh": "37",
+    "Arunachal Pradesh": "12",
+    "Assam": "18",
+    "Bihar": "10",
+    "Chandigarh": "04",
+    "Chhattisgarh": "22",
+    "Dadra and Nagar Haveli and Daman and Diu": "26",
+    "Delhi": "07",
+    "Goa": "30",
+    "Gujarat": "24",
+    "Haryana": "06",
+    "Himachal Pradesh": "02",
+    "Jammu and Kashmir": "01",
+    "Jharkhand": "20",
+    "Karnataka": "29",
+    "Kerala": "32",
+    "Ladakh": "38",
+    "Lakshadweep": "31",
+    "Madhya Pradesh": "23",
+    "Maharashtra": "27",
+    "Manipur": "14",
+    "Meghalaya": "17",
+    "Mizoram": "15",
+    "Nagaland": "13",
+    "Odisha": "21",
+    "Puducherry": "34",
+    "Punjab": "03",
+    "Rajasthan": "08",
+    "Sikkim": "11",
+    "Tamil Nadu": "33",
+    "Telangana": "36",
+    "Tripura": "16",
+    "Uttar Pradesh": "09",
+    "Uttarakhand": "05",
+    "West Bengal": "19",
+    "Other Territory": "97"
+}
+
+INDIAN_STATES_UTS = sorted(list(STATE_CODES.keys()))
+
+TRANSPORT_MODES = sorted([
+    "Road Transport", "Local Courier", "Cargo Service", "Hand Delivery",
+    "Buyer's Vehicle", "Air Cargo", "Railways", "Other"
+])
+
+PRODUCTS = ['Tshirt','Tshirt H/S, Lower','Tshirt F/S, Lower','Kurta, Lower','Sweater','Lower','TrackSuit','Socks', 'Tie']
+
+CLOTH_SIZES = sorted([
+    "S", "M", "L", "XL", "XXL", "XXXL",
+    "20","22","24","26","28","30","32","34","36", "38", "40", "42", "44", "46", "48", "50"
+])
+
+
+def get_profile(company):
+    profile = COMPANY_PROFILES.get(company)
+    if not profile: # Safety check
+        print("Error: Company profile not found. Using default.")
+        profile = COMPANY_PROFILES[DEFAULT_COMPANY]
+    return profile
+
+
+# --- Reverse lookup: GSTIN state prefix -> state ---
+STATE_BY_CODE = {code: state for state, code in STATE_CODES.items()}
+
+
+def state_from_gstin(gstin):
+    """(state, state_code) from the first two digits of a GSTIN, or None if they are not a known state code."""
+    code = gstin.strip()[:2]
+    state = STATE_BY_CODE.get(code)
+    return (state, code) if state else None
@@ -0,0 +1,264 @@
+"""Headless billing service for POS terminals and scripts: HTTP/JSON on localhost.
+
+    python billing_service.py [--port 8765] [--workers N] [--db invoices.db]
+
+Request bodies are invoice snapshots (see invoice_model); company must be a
+COMPANY_PROFILES key and a missing buyer state code is filled in from STATE_CODES
+or the buyer GSTIN, as the GUI does. Money in responses is decimal text.
+
+    GET  /health
+    GET  /companies     company profiles and state codes
+    POST /totals        totals of a snapshot; nothing is stored
+    POST /invoices      numbers and stores a snapshot with a billable line -> {"invoice_no", "totals"}
+    POST /pdf           the PDF of a snapshot, or of a stored invoice given {"invoice_no"}
+
+PDFs are rendered in worker processes through the PDF cache, so a reprint is a
+file read; store writes run on one thread, in order.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from billing_data import COMPANY_PROFILES, DEFAULT_COMPANY, STATE_CODES, state_from_gstin
+from invoice_model import BUYER_FIELDS, invoice_from_data, invoice_interstate, parse_gst_rate, parse_qty, parse_rate, to_money
+from settings import STORE_PATH
+
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 4 << 20
+MAX_HEADER_BYTES = 16 << 10
+TEXT_ITEM_FIELDS = ("description", "size", "hsn")
+NUMBER_ITEM_FIELDS = ("qty", "rate", "gst_rate")
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 411: "Length Required",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# --- Requests ---
+def prepare(data):
+    """Validates a snapshot from a client and completes it the way the GUI form would."""
+    if not isinstance(data, dict):
+        raise HttpError(400, "body must be a JSON object")
+    company = data.get("company") or DEFAULT_COMPANY
+    if company not in COMPANY_PROFILES:
+        raise HttpError(400, f"unknown company {company!r}")
+    try:
+        datetime.strptime(str(data.get("date", "")), "%d/%m/%Y")
+    except ValueError:
+        raise HttpError(400, "date must be dd/mm/yyyy")
+    buyer = data.get("buyer") or {}
+    items = data.get("items") or []
+    if not isinstance(buyer, dict) or not isinstance(items, list) or not all(isinstance(entry, dict) for entry in items):
+        raise HttpError(400, "buyer must be an object and items a list of objects")
+    if not all(buyer.get(field) is None or isinstance(buyer[field], str) for field in BUYER_FIELDS):
+        raise HttpError(400, "buyer fields must be strings")
+    buyer = {field: (buyer.get(field) or "").strip() for field in BUYER_FIELDS}
+    if buyer["state"] and not buyer["state_code"]:
+        buyer["state_code"] = STATE_CODES.get(buyer["state"], "")
+    if buyer["gstin"] and not buyer["state"]:
+        buyer["state"], buyer["state_code"] = state_from_gstin(buyer["gstin"].upper()) or ("", buyer["state_code"])
+    for line_no, entry in enumerate(items, 1):
+        if not all(entry.get(field) is None or isinstance(entry[field], str) for field in TEXT_ITEM_FIELDS) or \
+                not all(entry.get(field) is None or type(entry[field]) in (str, int, float) for field in NUMBER_ITEM_FIELDS):
+            raise HttpError(400, f"item {line_no}: description, size and hsn must be strings and qty, rate and gst_rate numbers or strings")
+        try:
+            qty, rate = parse_qty(entry.get("qty", "")), parse_rate(entry.get("rate", ""))
+            parse_gst_rate(entry.get("gst_rate"))  # finite, 0 to 100: GSTR-1 keys lines by rate on that assumption
+            to_money(qty * rate)
+        except (ValueError, ArithmeticError):
+            raise HttpError(400, f"item {line_no}: invalid qty, rate or gst_rate")
+        if qty < 0 or rate < 0:
+            raise HttpError(400, f"item {line_no}: qty and rate must not be negative")
+    # A client-supplied invoice_no is dropped: only the store issues numbers, and
+    # a stored invoice is printed by POST /pdf {"invoice_no"}
+    return {"company": company, "date": data["date"], "buyer": buyer, "items": items}
+
+
+def totals_json(data):
+    totals = invoice_from_data(data).totals(invoice_interstate(data))
+    result = {key: str(totals[key]) for key in ("total_before_tax", "cgst", "sgst", "igst", "grand_total")}
+    result["interstate"] = totals["interstate"]
+    result["slabs"] = [{key: str(value) for key, value in slab.items()} for slab in totals["slabs"]]
+    return result
+
+
+_pdf_cache = None
+
+
+def render_pdf(data):
+    """PDF bytes for a snapshot; runs in a worker process with its own PDF cache handle."""
+    global _pdf_cache
+    if _pdf_cache is None:
+        from pdf_cache import PdfCache
+        _pdf_cache = PdfCache()
+    with open(_pdf_cache.render(data), "rb") as f:
+        return f.read()
+
+
+class BillingService:
+    def __init__(self, store_path=STORE_PATH, workers=None):
+        self.store_path, self.workers = store_path, workers or os.cpu_count() or 1
+        self.store = None
+        self.store_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="store")  # SQLite connections stay on one thread
+        self.pdf_pool = ProcessPoolExecutor(max_workers=self.workers)
+        self.routes = {
+            ("GET", "/health"): self.health,
+            ("GET", "/companies"): self.companies,
+            ("POST", "/totals"): self.totals,
+            ("POST", "/invoices"): self.create_invoice,
+            ("POST", "/pdf"): self.pdf,
+        }
+
+    def close(self):
+        self.pdf_pool.shutdown(cancel_futures=True)
+        if self.store is not None: self.store_thread.submit(self.store.close).result()
+        self.store_thread.shutdown()
+
+    async def in_store(self, func, *args):
+        def run():
+            if self.store is None:
+                from invoice_store import InvoiceStore
+                self.store = InvoiceStore(self.store_path)
+            return func(self.store, *args)
+        return await asyncio.get_running_loop().run_in_executor(self.store_thread, run)
+
+    # --- Endpoints: each returns (content type, body bytes) or a JSON-able object ---
+    async def health(self, body):
+        return {"status": "ok"}
+
+    async def companies(self, body):
+        return {"default": DEFAULT_COMPANY, "companies": COMPANY_PROFILES, "state_codes": STATE_CODES}
+
+    async def totals(self, body):
+        return totals_json(prepare(body))
+
+    async def create_invoice(self, body):
+        data = prepare(body)
+        if not invoice_from_data(data).billable_items():
+            raise HttpError(400, "no billable items: each needs a description, a quantity and a rate")
+        try:
+            invoice_no = await self.in_store(lambda store: store.save(data))
+        except ValueError as e:
+            raise HttpError(400, str(e))
+        data["invoice_no"] = invoice_no
+        return {"invoice_no": invoice_no, "totals": totals_json(data)}
+
+    async def pdf(self, body):
+        if isinstance(body, dict) and set(body) == {"invoice_no"}:
+            data = await self.in_store(lambda store: store.get(str(body["invoice_no"])))
+            if data is None:
+                raise HttpError(404, f"no invoice {body['invoice_no']!r}")
+        else:
+            data = prepare(body)
+        pdf = await asyncio.get_running_loop().run_in_executor(self.pdf_pool, render_pdf, data)
+        return "application/pdf", pdf
+
+    # --- HTTP/1.1 with keep-alive ---
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    break  # client closed the connection
+                except asyncio.LimitOverrunError:
+                    await self.respond(writer, 413, {"error": "headers too large"}, keep_alive=False)
+                    break
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = request_line.split(" ")
+                except ValueError:
+                    await self.respond(writer, 400, {"error": "malformed request line"}, keep_alive=False)
+                    break
+                headers = {}
+                for line in header_lines:
+                    name, _, value = line.partition(":")
+                    if name: headers[name.strip().lower()] = value.strip()
+                keep_alive = headers.get("connection", "").lower() != "close" if version == "HTTP/1.1" else headers.get("connection", "").lower() == "keep-alive"
+                status, payload = await self.dispatch(method, target.split("?", 1)[0], headers, reader)
+                await self.respond(writer, status, payload, keep_alive)
+                if not keep_alive or status in (411, 413):  # the body was not read
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method, path, headers, reader):
+        try:
+            if "transfer-encoding" in headers:
+                raise HttpError(411, "send the body with a Content-Length")
+            try:
+                length = int(headers.get("content-length", "0"))
+            except ValueError:
+                length = -1
+            if length < 0:
+                raise HttpError(411, "invalid Content-Length")
+            if length > MAX_BODY_BYTES:
+                raise HttpError(413, f"body larger than {MAX_BODY_BYTES} bytes")
+            raw = await reader.readexactly(length) if length else b""
+            handler = self.routes.get((method, path))
+            if handler is None:
+                raise HttpError(405 if any(route_path == path for _, route_path in self.routes) else 404, f"no route {method} {path}")
+            if method == "POST" and not raw:
+                raise HttpError(411 if "content-length" not in headers else 400, "a JSON body is required")
+            try:
+                body = json.loads(raw) if raw else None
+            except ValueError:
+                raise HttpError(400, "body is not valid JSON")
+            return 200, await handler(body)
+        except HttpError as e:
+            return e.status, {"error": str(e)}
+        except ArithmeticError:
+            return 400, {"error": "amounts too large to compute"}
+        except asyncio.IncompleteReadError:
+            raise
+        except Exception as e:
+            print(f"{method} {path} failed: {e!r}", file=sys.stderr)
+            return 500, {"error": "internal error"}
+
+    async def respond(self, writer, status, payload, keep_alive):
+        if isinstance(payload, tuple):
+            content_type, body = payload
+        else:
+            content_type, body = "application/json", json.dumps(payload, ensure_ascii=False, default=str).encode()
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\nContent-Type: {content_type}\r\nContent-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+async def serve(host, port, store_path, workers):
+    service = BillingService(store_path, workers)
+    server = await asyncio.start_server(service.handle, host, port, limit=MAX_HEADER_BYTES)
+    address = server.sockets[0].getsockname()
+    print(f"Billing service on http://{address[0]}:{address[1]} ({service.workers} PDF workers, store {store_path})", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve invoice totals, numbering and PDFs over HTTP/JSON.")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to listen on (default: localhost only)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--db", default=STORE_PATH, help="invoice store that numbers and archives created invoices")
+    parser.add_argument("--workers", type=int, default=None, help="PDF worker processes (default: all cores)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.db, args.workers))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    sys.exit(main())
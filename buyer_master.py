@@ -0,0 +1,90 @@
+import csv
+from datetime import datetime
+from billing_data import state_from_gstin
+from invoice_store import connect
+from settings import STORE_PATH
+
+# --- Buyer master ---
+# Parties billed before, kept next to the invoices in the same SQLite file. GSTIN is
+# the primary lookup key; names are searched by case-insensitive prefix on an index.
+
+BUYER_COLUMNS = ("name", "address", "gstin", "state", "state_code")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS buyers (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    address TEXT NOT NULL DEFAULT '',
+    gstin TEXT UNIQUE,
+    state TEXT NOT NULL DEFAULT '',
+    state_code TEXT NOT NULL DEFAULT '',
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_buyers_name ON buyers (name COLLATE NOCASE);
+"""
+
+
+def normalize_gstin(gstin):
+    return "".join(gstin.split()).upper()
+
+
+class BuyerMaster:
+    def __init__(self, path=STORE_PATH):
+        self.conn = connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def _row(self, row):
+        return {column: value or "" for column, value in zip(BUYER_COLUMNS, row)} if row else None
+
+    def upsert(self, buyer):
+        """Adds or refreshes a buyer (a dict with BUYER_COLUMNS keys); state is derived from the GSTIN when missing."""
+        self.upsert_many([buyer])
+
+    def upsert_many(self, buyers):
+        records = []
+        for buyer in buyers:
+            name = buyer.get("name", "").strip()
+            if not name:
+                continue
+            gstin = normalize_gstin(buyer.get("gstin", "")) or None
+            state, state_code = buyer.get("state", ""), buyer.get("state_code", "")
+            if gstin and not state:
+                state, state_code = state_from_gstin(gstin) or ("", "")
+            records.append((name, buyer.get("address", "").strip(), gstin, state, state_code, datetime.now().isoformat(timespec="seconds")))
+        with self.conn:
+            self.conn.execute("BEGIN")
+            # Buyers with a GSTIN are updated in place; unregistered ones are matched by name (case-insensitive)
+            self.conn.executemany(
+                "INSERT INTO buyers (name, address, gstin, state, state_code, updated_at) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (gstin) DO UPDATE SET name = excluded.name, address = excluded.address, state = excluded.state, "
+                "state_code = excluded.state_code, updated_at = excluded.updated_at",
+                [r for r in records if r[2]])
+            for record in (r for r in records if not r[2]):
+                updated = self.conn.execute(
+                    "UPDATE buyers INDEXED BY idx_buyers_name SET address = ?, state = ?, state_code = ?, updated_at = ? "
+                    "WHERE name = ? COLLATE NOCASE AND gstin IS NULL",
+                    (record[1], record[3], record[4], record[5], record[0])).rowcount
+                if not updated:
+                    self.conn.execute("INSERT INTO buyers (name, address, gstin, state, state_code, updated_at) VALUES (?, ?, ?, ?, ?, ?)", record)
+
+    def import_csv(self, path):
+        """Loads parties from a CSV with name,address,gstin[,state,state_code] columns."""
+        with open(path, newline="", encoding="utf-8") as f:
+            self.upsert_many(csv.DictReader(f))
+
+    def by_gstin(self, gstin):
+        row = self.conn.execute(
+            f"SELECT {', '.join(BUYER_COLUMNS)} FROM buyers WHERE gstin = ?", (normalize_gstin(gstin),)).fetchone()
+        return self._row(row)
+
+    def search_name(self, prefix, limit=20):
+        prefix = prefix.strip()
+        if not prefix:
+            return []
+        rows = self.conn.execute(
+            f"SELECT {', '.join(BUYER_COLUMNS)} FROM buyers WHERE name >= ? COLLATE NOCASE AND name < ? COLLATE NOCASE "
+            "ORDER BY name COLLATE NOCASE LIMIT ?", (prefix, prefix + "\U0010ffff", limit)).fetchall()
+        return [self._row(row) for row in rows]
@@ -0,0 +1,34 @@
+import customtkinter as ctk
+from instrumentation import metrics
+
+# --- Debug overlay (F12 when running with --instrument) ---
+# A small always-on-top window with the live latency histograms, refreshed while open.
+
+REFRESH_MS = 500
+
+
+class DebugOverlay(ctk.CTkToplevel):
+    def __init__(self, master):
+        super().__init__(master)
+        self.title("Latency (ms)"); self.geometry("640x340"); self.attributes("-topmost", True)
+        self.text = ctk.CTkTextbox(self, font=ctk.CTkFont(family="Courier", size=12), wrap="none")
+        self.text.pack(fill="both", expand=True, padx=5, pady=5)
+        buttons = ctk.CTkFrame(self, fg_color="transparent"); buttons.pack(fill="x")
+        ctk.CTkButton(buttons, text="Save JSON", command=self.save, width=90).pack(side="left", padx=5, pady=5)
+        ctk.CTkButton(buttons, text="Reset", command=metrics.reset, width=70).pack(side="left", padx=5, pady=5)
+        self.status_label = ctk.CTkLabel(buttons, text=""); self.status_label.pack(side="left", padx=5)
+        self.refresh()
+
+    def refresh(self):
+        if not self.winfo_exists():
+            return
+        lines = [f"{'metric':<24}{'calls':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>10}"]
+        for name, stats in metrics.summaries().items():
+            lines.append(f"{name:<24}{stats['count']:>8}{stats['p50_ms']:>9.2f}{stats['p95_ms']:>9.2f}{stats['p99_ms']:>9.2f}{stats['max_ms']:>10.2f}")
+        self.text.configure(state="normal")
+        self.text.delete("1.0", "end"); self.text.insert("1.0", "\n".join(lines))
+        self.text.configure(state="disabled")
+        self.after(REFRESH_MS, self.refresh)
+
+    def save(self):
+        self.status_label.configure(text=f"Saved {metrics.dump()}")
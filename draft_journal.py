@@ -0,0 +1,177 @@
+import json
+import os
+import zlib
+from invoice_model import BUYER_FIELDS
+from settings import DRAFT_PATH
+
+# --- Draft journal ---
+# The invoice being typed is kept as an append-only log of edit operations, so a
+# crash or power cut loses at most the last unflushed second of typing and saving
+# never rewrites the whole invoice. Each line is "<crc32 hex> <json op>"; replay
+# stops at the first line that is torn or fails its checksum. compact() replaces
+# the log with a single snapshot op via a temp file and os.replace, so the file on
+# disk is always either the old journal or the new one.
+#
+# Ops: {"op": "add", "id"}, {"op": "set", "id", "f": {field: text}}, {"op": "del", "id"},
+#      {"op": "clear"} (all rows), {"op": "form", "f": {field: text}} and
+#      {"op": "snapshot", "form", "rows": [[id, fields]], "next_id", "issued_as"}.
+
+ROW_FIELDS = ("description", "size", "qty", "rate", "hsn", "gst_rate")
+FORM_FIELDS = ("company", "date") + BUYER_FIELDS
+
+
+def _line(op):
+    payload = json.dumps(op, ensure_ascii=False, separators=(",", ":"))
+    return f"{zlib.crc32(payload.encode()):08x} {payload}\n"
+
+
+def _fsync_dir(path):
+    # Makes the rename itself durable; directories cannot be opened on Windows
+    if hasattr(os, "O_DIRECTORY"):
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+        try: os.fsync(fd)
+        finally: os.close(fd)
+
+
+class Draft:
+    """Draft state replayed from the journal: form fields, row fields by journal id
+    (in screen order) and, right after Generate PDF, the number it was issued as."""
+
+    def __init__(self):
+        self.form = {}
+        self.rows = {}
+        self.next_id = 1
+        self.issued_as = None
+
+    def apply(self, op):
+        kind = op["op"]
+        if kind == "snapshot":
+            self.form = dict(op["form"])
+            self.rows = {row_id: dict(fields) for row_id, fields in op["rows"]}
+            self.next_id, self.issued_as = op["next_id"], op.get("issued_as")
+            return
+        if kind == "add":
+            self.rows[op["id"]] = dict.fromkeys(ROW_FIELDS, "")
+            self.next_id = max(self.next_id, op["id"] + 1)
+        elif kind == "set":
+            fields = self.rows.get(op["id"])
+            if fields is not None: fields.update(op["f"])
+        elif kind == "del":
+            self.rows.pop(op["id"], None)
+        elif kind == "clear":
+            self.rows.clear()
+        elif kind == "form":
+            self.form.update(op["f"])
+        self.issued_as = None  # edited since it was issued
+
+    def is_blank(self):
+        """True when nothing worth restoring was typed (company and date alone don't count)."""
+        if any(self.form.get(field) for field in BUYER_FIELDS):
+            return False
+        return not any(fields["description"] or fields["qty"] or fields["rate"] for fields in self.rows.values())
+
+    def items(self):
+        return [dict(fields) for fields in self.rows.values()]
+
+
+class DraftJournal:
+    """Records edits to the on-screen invoice; flush() appends them to disk in one write."""
+
+    def __init__(self, path=DRAFT_PATH):
+        self.path = path
+        self.draft = Draft()
+        self.pending = []
+        self.ops_on_disk = 0
+        self.paused = False  # while the screen is being built or restored
+
+    @staticmethod
+    def read(path=DRAFT_PATH):
+        """(Draft, op count) replayed from the journal at path; an empty Draft if there is none."""
+        draft, ops = Draft(), 0
+        try:
+            f = open(path, encoding="utf-8", errors="replace")
+        except FileNotFoundError:
+            return draft, 0
+        with f:
+            for line in f:
+                crc, _, payload = line.rstrip("\n").partition(" ")
+                if not line.endswith("\n") or f"{zlib.crc32(payload.encode()):08x}" != crc:
+                    break  # torn or corrupt tail: everything before it is intact
+                try:
+                    draft.apply(json.loads(payload))
+                except (ValueError, KeyError, TypeError):
+                    break
+                ops += 1
+        return draft, ops
+
+    def _record(self, op):
+        if self.paused:
+            return
+        self.draft.apply(op)
+        self.pending.append(op)
+
+    # --- Edits ---
+    def add_row(self, row):
+        row.draft_id = self.draft.next_id
+        self._record({"op": "add", "id": row.draft_id})
+        self.update_row(row)
+
+    def update_row(self, row):
+        fields = self.draft.rows.get(row.draft_id)
+        if fields is None or self.paused:
+            return
+        changed = {}
+        for field in ROW_FIELDS:
+            value = str(getattr(row, field))
+            if fields[field] != value: changed[field] = value
+        if changed: self._record({"op": "set", "id": row.draft_id, "f": changed})
+
+    def delete_row(self, row):
+        if row.draft_id in self.draft.rows: self._record({"op": "del", "id": row.draft_id})
+
+    def clear_rows(self):
+        if self.draft.rows: self._record({"op": "clear"})
+
+    def update_form(self, form):
+        changed = {field: value for field, value in form.items() if self.draft.form.get(field, "") != value}
+        if changed: self._record({"op": "form", "f": changed})
+
+    # --- Disk ---
+    def flush(self):
+        """Appends the pending ops with a single write and fsync."""
+        if not self.pending:
+            return
+        data = "".join(_line(op) for op in self.pending)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(data); f.flush(); os.fsync(f.fileno())
+        self.ops_on_disk += len(self.pending)
+        self.pending.clear()
+
+    def compact(self):
+        """Atomically rewrites the journal as one snapshot of the current draft."""
+        draft = self.draft
+        snapshot = {"op": "snapshot", "form": draft.form, "rows": [[row_id, fields] for row_id, fields in draft.rows.items()],
+                    "next_id": draft.next_id, "issued_as": draft.issued_as}
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(_line(snapshot)); f.flush(); os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        _fsync_dir(self.path)
+        self.pending.clear()
+        self.ops_on_disk = 1
+
+    def start(self, rows, form, issued_as=None):
+        """Makes the journal describe exactly this screen, replacing whatever it held.
+
+        Also drops a torn tail left by a crash, which would otherwise hide every op appended after it.
+        """
+        self.paused = False
+        self.draft, self.pending = Draft(), []
+        for row in rows:
+            row.draft_id = self.draft.next_id
+            self.draft.apply({"op": "add", "id": row.draft_id})
+            self.draft.rows[row.draft_id].update((field, str(getattr(row, field))) for field in ROW_FIELDS)
+        self.draft.form.update(form)
+        self.draft.issued_as = issued_as
+        self.compact()
@@ -0,0 +1,112 @@
+from decimal import Decimal, ROUND_HALF_UP
+
+# --- GST engine ---
+# One place that turns taxable value per GST slab into CGST/SGST or IGST. Intra-state
+# supplies split each slab's rate equally into CGST and SGST; inter-state supplies
+# (buyer state code differs from the company GSTIN's) are charged IGST. Tax is
+# rounded half-up to the paisa per slab.
+#
+# compute_gst_many does the same for thousands of invoices at once (month-end batches
+# and reports) in one vectorized pass over integer paise; NumPy is imported only there.
+
+PAISE = Decimal("0.01")
+ZERO = Decimal("0.00")
+
+
+def _money(value):
+    return value.quantize(PAISE, rounding=ROUND_HALF_UP)
+
+
+def is_interstate(company_gstin, buyer_state_code="", buyer_gstin=""):
+    """True when the buyer's state differs from the company's; an unknown buyer state counts as local."""
+    buyer_code = (buyer_state_code or "").strip() or (buyer_gstin or "").strip()[:2]
+    company_code = (company_gstin or "").strip()[:2]
+    return bool(buyer_code) and bool(company_code) and buyer_code != company_code
+
+
+def compute_gst(taxable_by_rate, interstate=False):
+    """Per-slab and total tax for {gst_rate_percent: taxable Decimal}.
+
+    Returns a dict with total_before_tax, cgst, sgst, igst, grand_total and slabs,
+    a list of {rate, taxable, cgst, sgst, igst} sorted by rate.
+    """
+    slabs, taxable_total, cgst, sgst, igst = [], ZERO, ZERO, ZERO, ZERO
+    for rate in sorted(taxable_by_rate):
+        taxable = _money(taxable_by_rate[rate])
+        if interstate:
+            slab = {"rate": rate, "taxable": taxable, "cgst": ZERO, "sgst": ZERO, "igst": _money(taxable * rate / 100)}
+        else:
+            half = _money(taxable * rate / 200)
+            slab = {"rate": rate, "taxable": taxable, "cgst": half, "sgst": half, "igst": ZERO}
+        slabs.append(slab)
+        taxable_total += taxable; cgst += slab["cgst"]; sgst += slab["sgst"]; igst += slab["igst"]
+    return {
+        "total_before_tax": taxable_total,
+        "cgst": cgst,
+        "sgst": sgst,
+        "igst": igst,
+        "grand_total": taxable_total + cgst + sgst + igst,
+        "slabs": slabs,
+        "interstate": interstate,
+    }
+
+
+def format_rate(rate):
+    return f"{rate.normalize():f}" if isinstance(rate, Decimal) else str(rate)
+
+
+def tax_labels(totals):
+    """('CGST @ 2.5%', 'SGST @ 2.5%', 'IGST @ 0%') style captions for the rates actually charged."""
+    rates = [slab["rate"] for slab in totals["slabs"] if slab["taxable"]] or [Decimal(5)]
+    halves = "/".join(format_rate(rate / 2) for rate in rates)
+    fulls = "/".join(format_rate(rate) for rate in rates)
+    if totals["interstate"]:
+        return "CGST @ 0%", "SGST @ 0%", f"IGST @ {fulls}%"
+    return f"CGST @ {halves}%", f"SGST @ {halves}%", "IGST @ 0%"
+
+
+# --- Vectorized engine for many invoices at once ---
+def rate_basis_points(rate):
+    """GST rate percent as integer basis points (5 -> 500), the unit the vectorized engine works in."""
+    return int(Decimal(rate) * 100)
+
+
+# Slab keys are invoice * RATE_SPAN + rate in basis points; rates never exceed 100% = 10000 bp
+RATE_SPAN = 10_001
+
+
+def sum_by_key(keys, values):
+    """Groups rows by an int64 key: (unique_keys, row_counts, per-key sums of each row of the 2-D values)."""
+    import numpy as np
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+    starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    counts = np.diff(np.append(starts, keys.size))
+    return keys[starts], counts, np.add.reduceat(values[:, order], starts, axis=1)
+
+
+def _round_div(np, numerator, divisor):
+    # Half-up away from zero on integers, matching Decimal ROUND_HALF_UP
+    return np.sign(numerator) * ((np.abs(numerator) * 2 + divisor) // (2 * divisor))
+
+
+def compute_gst_many(invoice_index, amounts_paise, rates_bp, interstate):
+    """compute_gst for a whole batch of invoices in one NumPy pass over integer paise.
+
+    invoice_index, amounts_paise and rates_bp describe one line each; interstate is
+    one bool per invoice. Returns (slab_invoice, slab_rate_bp, taxable, cgst, sgst, igst)
+    int64 arrays with one entry per (invoice, slab), rounded exactly like compute_gst.
+    """
+    import numpy as np
+    if not len(invoice_index):
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty, empty, empty, empty
+    keys = np.asarray(invoice_index, dtype=np.int64) * RATE_SPAN + np.asarray(rates_bp, dtype=np.int64)
+    slab_keys, _, sums = sum_by_key(keys, np.asarray(amounts_paise, dtype=np.int64)[np.newaxis])
+    taxable = sums[0]
+    slab_invoice, slab_rate = np.divmod(slab_keys, RATE_SPAN)
+    inter = np.asarray(interstate, dtype=bool)[slab_invoice]
+    half = _round_div(np, taxable * slab_rate, 20_000)
+    full = _round_div(np, taxable * slab_rate, 10_000)
+    zero = np.zeros_like(taxable)
+    return slab_invoice, slab_rate, taxable, np.where(inter, zero, half), np.where(inter, zero, half), np.where(inter, full, zero)
@@ -0,0 +1,289 @@
+"""GSTR-1 style summaries of the invoices issued in a month or financial year.
+
+Reads the invoice store and writes B2B (per buyer GSTIN and rate), B2CL (large
+inter-state B2C invoices), B2CS (per place of supply and rate) and per-rate
+totals as CSV and/or JSON. Usage:
+
+    python gstr1_report.py --month 2026-10 [--company NAME] [--out-dir reports/] [--format csv|json|both]
+    python gstr1_report.py --fy 2026-27 ...
+
+A return is filed per GSTIN, so without --company one set of files is written
+for each company that issued invoices in the period.
+
+Invoices are read a chunk at a time and taxed per slab with the vectorized GST
+engine. Memory grows with the number of buyers, states and rates in the period,
+not with the number of invoices.
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import time
+from decimal import Decimal
+from billing_data import COMPANY_PROFILES, STATE_BY_CODE
+from gst import RATE_SPAN, compute_gst_many, format_rate, is_interstate, rate_basis_points, sum_by_key
+from invoice_store import InvoiceStore
+from settings import STORE_PATH
+
+CHUNK_INVOICES = 20000
+# Inter-state invoices to unregistered buyers above this value are reported one by one (B2CL)
+B2CL_LIMIT_PAISE = 100000 * 100
+
+PERIOD_FILTER = "invoice_date BETWEEN ? AND ?"
+INVOICE_QUERY = ("SELECT id, company, buyer_gstin, buyer_name, buyer_state_code, invoice_no, invoice_date, grand_total "
+                 "FROM invoices WHERE {} ORDER BY id")
+# Lines of the chunk's invoices only: the invoice filter is repeated, so lines of
+# invoices in the id range but outside the period or company never leave SQLite.
+# NOT INDEXED keeps SQLite on the rowid range instead of rescanning the period per chunk
+LINE_QUERY = ("SELECT invoice_items.invoice_id, invoice_items.gst_rate, invoice_items.amount "
+              "FROM invoices NOT INDEXED CROSS JOIN invoice_items ON invoice_items.invoice_id = invoices.id "
+              "WHERE invoices.id BETWEEN ? AND ? AND {}")
+
+B2B_COLUMNS = ("buyer_gstin", "buyer_name", "place_of_supply", "rate", "invoices", "taxable_value", "cgst", "sgst", "igst")
+B2CL_COLUMNS = ("invoice_no", "invoice_date", "place_of_supply", "invoice_value", "rate", "taxable_value", "igst")
+B2CS_COLUMNS = ("place_of_supply", "supply_type", "rate", "invoices", "taxable_value", "cgst", "sgst", "igst")
+RATE_COLUMNS = ("category", "rate", "invoices", "taxable_value", "cgst", "sgst", "igst")
+
+
+def money(paise):
+    return f"{Decimal(paise) / 100:.2f}"
+
+
+def rate_text(rate_bp):
+    return format_rate(Decimal(rate_bp) / 100)
+
+
+def place_of_supply(code):
+    return f"{code}-{STATE_BY_CODE[code]}" if code in STATE_BY_CODE else code
+
+
+# --- Streaming invoice slabs ---
+def iter_slab_chunks(conn, date_from, date_to, company=None, chunk=CHUNK_INVOICES):
+    """Yields (invoice_rows, interstate, slabs) per chunk of invoices in the period.
+
+    invoice_rows are INVOICE_QUERY tuples, interstate one bool per invoice and slabs
+    the compute_gst_many arrays, indexing invoice_rows by position.
+    """
+    import numpy as np
+    where, params = PERIOD_FILTER, [date_from, date_to]
+    if company:
+        where += " AND company = ?"; params.append(company)
+    company_gstin = {name: profile["gstin"] for name, profile in COMPANY_PROFILES.items()}
+    rate_bp = {}
+    line_query = LINE_QUERY.format(where)
+    invoices = conn.execute(INVOICE_QUERY.format(where), params)
+    while True:
+        rows = invoices.fetchmany(chunk)
+        if not rows:
+            break
+        line_ids, rates, amounts = [], [], []
+        lines = conn.execute(line_query, [rows[0][0], rows[-1][0]] + params)
+        while True:
+            batch = lines.fetchmany(chunk)
+            if not batch:
+                break
+            for invoice_id, rate, amount in batch:
+                line_ids.append(invoice_id); rates.append(rate); amounts.append(amount)
+        if not line_ids:
+            continue
+        ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        local = np.searchsorted(ids, np.array(line_ids, dtype=np.int64))
+        for rate in set(rates).difference(rate_bp):
+            rate_bp[rate] = rate_basis_points(rate)
+        interstate = [is_interstate(company_gstin.get(row[1], ""), row[4], row[2]) for row in rows]
+        yield rows, interstate, compute_gst_many(local, np.array(amounts, dtype=np.int64),
+                                                 np.array([rate_bp[rate] for rate in rates], dtype=np.int64), interstate)
+
+
+# --- Aggregation ---
+class Gstr1Summary:
+    """Running GSTR-1 sections; every money figure is integer paise until written out.
+
+    Each chunk is grouped with NumPy and only the per-group sums are merged here,
+    keyed by group * RATE_SPAN + rate: b2b groups are buyer parties, b2cs groups
+    are place of supply * 2 + interstate, rates groups are 0 for B2B and 1 for B2C.
+    """
+
+    def __init__(self):
+        self.b2b, self.b2cs, self.rates, self.b2cl = {}, {}, {}, []
+        self.parties, self._party_index = [], {}
+        self.places, self._place_index = [], {}
+        self.invoice_count = 0
+
+    def _place(self, code):
+        index = self._place_index.get(code)
+        if index is None:
+            index = self._place_index[code] = len(self.places)
+            self.places.append(code)
+        return index
+
+    def _party(self, gstin, name, place):
+        index = self._party_index.get(gstin)
+        if index is None:
+            index = self._party_index[gstin] = len(self.parties)
+            self.parties.append((gstin, name, place))
+        return index
+
+    @staticmethod
+    def _accumulate(bucket, keys, columns):
+        if not keys.size:
+            return
+        unique_keys, counts, group_sums = sum_by_key(keys, columns)
+        for key, count, *values in zip(unique_keys.tolist(), counts.tolist(), *group_sums.tolist()):
+            sums = bucket.get(key)
+            if sums is None:
+                bucket[key] = [count, *values]
+            else:
+                sums[0] += count
+                for i, value in enumerate(values, 1): sums[i] += value
+
+    def add_chunk(self, rows, interstate, slabs):
+        import numpy as np
+        slab_invoice, rate, taxable, cgst, sgst, igst = slabs
+        party = np.full(len(rows), -1, dtype=np.int64)
+        place = np.empty(len(rows), dtype=np.int64)
+        large = np.zeros(len(rows), dtype=bool)
+        for k, (_, company, gstin, name, state_code, _, _, grand_total) in enumerate(rows):
+            pos = state_code or gstin[:2] or COMPANY_PROFILES.get(company, {}).get("gstin", "")[:2]
+            place[k] = index = self._place(pos)
+            if gstin:
+                party[k] = self._party(gstin, name, index)
+            else:
+                large[k] = interstate[k] and grand_total > B2CL_LIMIT_PAISE
+        self.invoice_count += np.unique(slab_invoice).size
+        columns = np.stack((taxable, cgst, sgst, igst))
+        slab_party, inter, b2cl = party[slab_invoice], np.asarray(interstate)[slab_invoice], large[slab_invoice]
+        b2b = slab_party >= 0
+        b2cs = ~b2b & ~b2cl
+        self._accumulate(self.b2b, slab_party[b2b] * RATE_SPAN + rate[b2b], columns[:, b2b])
+        self._accumulate(self.b2cs, (place[slab_invoice][b2cs] * 2 + inter[b2cs]) * RATE_SPAN + rate[b2cs], columns[:, b2cs])
+        self._accumulate(self.rates, (~b2b).astype(np.int64) * RATE_SPAN + rate, columns)
+        for k, slab_rate, slab_taxable, slab_igst in zip(*(array[b2cl].tolist() for array in (slab_invoice, rate, taxable, igst))):
+            invoice_no, invoice_date, grand_total = rows[k][5:8]
+            self.b2cl.append((invoice_no, invoice_date, self.places[place[k]], grand_total, slab_rate, slab_taxable, slab_igst))
+
+    def totals(self):
+        return [sum(sums[i] for sums in self.rates.values()) for i in range(1, 5)]
+
+    # --- Output rows ---
+    def sections(self):
+        """{section: (columns, rows)} with money and rates formatted as text."""
+        b2b = []
+        for key, (count, taxable, cgst, sgst, igst) in self.b2b.items():
+            party, rate = divmod(key, RATE_SPAN)
+            gstin, name, place = self.parties[party]
+            b2b.append((gstin, name, place_of_supply(self.places[place]), rate, count, taxable, cgst, sgst, igst))
+        b2cs = []
+        for key, (count, taxable, cgst, sgst, igst) in self.b2cs.items():
+            group, rate = divmod(key, RATE_SPAN)
+            place, inter = divmod(group, 2)
+            b2cs.append((place_of_supply(self.places[place]), "INTER" if inter else "INTRA", rate, count, taxable, cgst, sgst, igst))
+        rates = [("B2C" if group else "B2B", rate, *sums) for (group, rate), sums in
+                 ((divmod(key, RATE_SPAN), sums) for key, sums in self.rates.items())]
+        b2cl = [(invoice_no, invoice_date, place_of_supply(pos), value, rate, taxable, igst)
+                for invoice_no, invoice_date, pos, value, rate, taxable, igst in self.b2cl]
+        return {
+            "b2b": (B2B_COLUMNS, [_format(row, 3, 5) for row in sorted(b2b)]),
+            "b2cl": (B2CL_COLUMNS, [_format(row, 4, 5, 3) for row in sorted(b2cl)]),
+            "b2cs": (B2CS_COLUMNS, [_format(row, 2, 4) for row in sorted(b2cs)]),
+            "rates": (RATE_COLUMNS, [_format(row, 1, 3) for row in sorted(rates)]),
+        }
+
+
+def _format(row, rate_column, money_from, *money_columns):
+    """Row with its rate (basis points) and money (paise, from money_from on plus money_columns) as text."""
+    row = list(row)
+    row[rate_column] = rate_text(row[rate_column])
+    for i in (*money_columns, *range(money_from, len(row))):
+        row[i] = money(row[i])
+    return row
+
+
+def companies_in_period(conn, date_from, date_to):
+    return [row[0] for row in conn.execute(f"SELECT DISTINCT company FROM invoices WHERE {PERIOD_FILTER} ORDER BY company", (date_from, date_to))]
+
+
+def build_summary(conn, date_from, date_to, company=None):
+    summary = Gstr1Summary()
+    for chunk in iter_slab_chunks(conn, date_from, date_to, company):
+        summary.add_chunk(*chunk)
+    return summary
+
+
+# --- Writers ---
+def write_csv(summary, out_dir, prefix):
+    paths = []
+    for section, (columns, rows) in summary.sections().items():
+        path = os.path.join(out_dir, f"{prefix}_{section}.csv")
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            writer.writerows(rows)
+        paths.append(path)
+    return paths
+
+
+def write_json(summary, out_dir, prefix, period, gstin=""):
+    taxable, cgst, sgst, igst = summary.totals()
+    document = {
+        "gstin": gstin,
+        "period": period,
+        "invoices": summary.invoice_count,
+        "totals": {"taxable_value": money(taxable), "cgst": money(cgst), "sgst": money(sgst), "igst": money(igst)},
+    }
+    for section, (columns, rows) in summary.sections().items():
+        document[section] = [dict(zip(columns, row)) for row in rows]
+    path = os.path.join(out_dir, f"{prefix}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=1)
+    return [path]
+
+
+# --- Command line ---
+def period_range(month=None, fy=None):
+    """(date_from, date_to, label) as ISO dates for --month yyyy-mm or --fy yyyy-yy."""
+    if month:
+        if not re.fullmatch(r"\d{4}-(0[1-9]|1[0-2])", month):
+            raise ValueError(f"Invalid month: {month!r} (expected yyyy-mm)")
+        return f"{month}-01", f"{month}-31", month
+    match = re.fullmatch(r"(\d{4})-(\d{2})", fy or "")
+    if not match or (int(match.group(1)) + 1) % 100 != int(match.group(2)):
+        raise ValueError(f"Invalid financial year: {fy!r} (expected e.g. 2026-27)")
+    start = int(match.group(1))
+    return f"{start}-04-01", f"{start + 1}-03-31", fy
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="GSTR-1 style summaries of stored invoices.")
+    period = parser.add_mutually_exclusive_group(required=True)
+    period.add_argument("--month", help="calendar month, yyyy-mm")
+    period.add_argument("--fy", help="financial year, e.g. 2026-27")
+    parser.add_argument("--company", default=None, help="only this company's invoices (default: one report per company)")
+    parser.add_argument("--db", default=STORE_PATH, help="invoice store to read")
+    parser.add_argument("--out-dir", default="reports", help="directory for the CSV/JSON files")
+    parser.add_argument("--format", choices=("csv", "json", "both"), default="both")
+    args = parser.parse_args(argv)
+    try:
+        date_from, date_to, label = period_range(args.month, args.fy)
+    except ValueError as e:
+        parser.error(str(e))
+    os.makedirs(args.out_dir, exist_ok=True)
+    start = time.perf_counter()
+    paths = []
+    with InvoiceStore(args.db) as store:
+        for company in [args.company] if args.company else companies_in_period(store.conn, date_from, date_to):
+            summary = build_summary(store.conn, date_from, date_to, company)
+            gstin = COMPANY_PROFILES.get(company, {}).get("gstin", "")
+            prefix = f"gstr1_{label}_{gstin or company.replace(' ', '_')}"
+            if args.format in ("csv", "both"): paths += write_csv(summary, args.out_dir, prefix)
+            if args.format in ("json", "both"): paths += write_json(summary, args.out_dir, prefix, label, gstin)
+            taxable, cgst, sgst, igst = summary.totals()
+            print(f"{company} ({gstin or 'no GSTIN'}): {summary.invoice_count} invoices, taxable {money(taxable)}, "
+                  f"CGST {money(cgst)}, SGST {money(sgst)}, IGST {money(igst)}")
+    print(f"Wrote {len(paths)} files to {args.out_dir} in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
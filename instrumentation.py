@@ -0,0 +1,155 @@
+"""Latency histograms for the GUI hot paths.
+
+Enabled with `python latestcode4 --instrument` (or BILLING_INSTRUMENT=1). When
+disabled, `metrics.timed` returns the function unchanged and `metrics.span` is a
+no-op, so instrumented code pays nothing. When enabled, F12 in the app opens the
+debug overlay and the collected histograms are written to JSON on exit.
+
+Compare two dumps, e.g. from two releases:
+
+    python instrumentation.py before.json after.json
+"""
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from settings import DATA_DIR, INSTRUMENT
+
+# Bucket b counts durations in [2**(b-1), 2**b) microseconds; the last one is open-ended (> ~8 s)
+BUCKETS = 24
+
+
+class LatencyHistogram:
+    __slots__ = ("counts", "count", "total_ns", "max_ns")
+
+    def __init__(self):
+        self.counts = [0] * BUCKETS
+        self.count = self.total_ns = self.max_ns = 0
+
+    def record(self, ns):
+        self.counts[min((ns // 1000).bit_length(), BUCKETS - 1)] += 1
+        self.count += 1
+        self.total_ns += ns
+        if ns > self.max_ns: self.max_ns = ns
+
+    def percentile_ms(self, q):
+        """Upper bound of the bucket holding the q-th quantile (0 < q <= 1), capped at the maximum seen."""
+        if not self.count:
+            return 0.0
+        target, seen = q * self.count, 0
+        for bucket, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                return min((1 << bucket) / 1000, self.max_ns / 1e6)
+        return self.max_ns / 1e6
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ns / self.count / 1e6, 3) if self.count else 0.0,
+            "p50_ms": self.percentile_ms(0.50),
+            "p95_ms": self.percentile_ms(0.95),
+            "p99_ms": self.percentile_ms(0.99),
+            "max_ms": round(self.max_ns / 1e6, 3),
+            "buckets_us": {str(1 << b): n for b, n in enumerate(self.counts) if n},
+        }
+
+
+class Metrics:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.histograms = {}
+        self._open = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, ns):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = LatencyHistogram()
+            histogram.record(ns)
+
+    def timed(self, name):
+        """Decorator recording each call's duration under name; the identity when disabled."""
+        def decorate(func):
+            if not self.enabled:
+                return func
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter_ns()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter_ns() - start)
+            return wrapper
+        return decorate
+
+    def span(self, name):
+        """Context manager timing a block; usable from any thread."""
+        return self._span(name) if self.enabled else nullcontext()
+
+    @contextmanager
+    def _span(self, name):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter_ns() - start)
+
+    # --- Intervals spanning several events (e.g. first keystroke -> repaint) ---
+    def begin(self, name):
+        """Starts an interval unless one with this name is already open."""
+        if self.enabled: self._open.setdefault(name, time.perf_counter_ns())
+
+    def end(self, name):
+        start = self._open.pop(name, None) if self.enabled else None
+        if start is not None: self.record(name, time.perf_counter_ns() - start)
+
+    # --- Reporting ---
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+
+    def summaries(self):
+        with self._lock:
+            return {name: histogram.summary() for name, histogram in sorted(self.histograms.items())}
+
+    def dump(self, path=None):
+        """Writes all histograms to JSON and returns the path."""
+        path = path or os.path.join(DATA_DIR, "instrumentation", time.strftime("metrics-%Y%m%d-%H%M%S.json"))
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        document = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "metrics": self.summaries(),
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=1)
+        return path
+
+
+metrics = Metrics(INSTRUMENT or "--instrument" in sys.argv)
+
+
+def compare(before_path, after_path, out=None):
+    """Prints p50/p95/p99 of every metric in two dumps side by side."""
+    out = out or sys.stdout
+    with open(before_path, encoding="utf-8") as f: before = json.load(f)["metrics"]
+    with open(after_path, encoding="utf-8") as f: after = json.load(f)["metrics"]
+    print(f"{'metric':<24} {'p50 ms':>15} {'p95 ms':>15} {'p99 ms':>15} {'calls':>13}", file=out)
+    for name in sorted(set(before) | set(after)):
+        old, new = before.get(name, {}), after.get(name, {})
+        cells = [f"{old.get(key, 0):>6.2f} ->{new.get(key, 0):>6.2f}" for key in ("p50_ms", "p95_ms", "p99_ms")]
+        print(f"{name:<24} {cells[0]:>15} {cells[1]:>15} {cells[2]:>15} {old.get('count', 0):>6}/{new.get('count', 0):<6}", file=out)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("usage: python instrumentation.py before.json after.json")
+    compare(sys.argv[1], sys.argv[2])
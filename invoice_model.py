@@ -0,0 +1,222 @@
+import re
+from contextlib import contextmanager
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from billing_data import get_profile
+from gst import compute_gst, is_interstate
+
+# --- Money helpers ---
+PAISE = Decimal("0.01")
+ZERO = Decimal("0.00")
+DEFAULT_GST_RATE = Decimal("5")  # percent, split equally into CGST and SGST
+MAX_RATE = Decimal(10) ** 12  # keeps qty * rate within what to_money can quantize
+MAX_GST_RATE = Decimal(100)
+
+
+def to_money(value):
+    """Rounds a Decimal (or anything Decimal accepts) to whole paise."""
+    return Decimal(value).quantize(PAISE, rounding=ROUND_HALF_UP)
+
+
+def parse_qty(text):
+    text = str(text).strip() if text is not None else ""
+    return int(text) if text else 0
+
+
+def parse_rate(text):
+    text = str(text).strip() if text is not None else ""
+    if not text:
+        return ZERO
+    try:
+        rate = Decimal(text)
+    except InvalidOperation:
+        raise ValueError(f"Invalid rate: {text!r}")
+    # Exponents ("1e30") are not prices anyone types, and huge values cannot be rounded to paise
+    if not rate.is_finite() or "e" in text.lower() or abs(rate) >= MAX_RATE:
+        raise ValueError(f"Invalid rate: {text!r}")
+    return rate
+
+
+def parse_gst_rate(text):
+    """GST percentage; blank means DEFAULT_GST_RATE. Only finite rates from 0 to 100 are valid."""
+    text = str(text).strip() if text is not None else ""
+    if not text:
+        return DEFAULT_GST_RATE
+    try:
+        rate = Decimal(text)
+    except InvalidOperation:
+        raise ValueError(f"Invalid GST rate: {text!r}")
+    # NaN (what pandas writes for an empty cell) would break every totals() call
+    if not rate.is_finite() or not 0 <= rate <= MAX_GST_RATE:
+        raise ValueError(f"Invalid GST rate: {text!r}")
+    return rate
+
+
+# --- Line items ---
+class LineItem:
+    __slots__ = ("description", "size", "qty", "rate", "gst_rate", "amount")
+
+    def __init__(self, description="", size="", qty=0, rate=ZERO, gst_rate=DEFAULT_GST_RATE):
+        self.description = description
+        self.size = size
+        self.qty = qty
+        self.rate = Decimal(rate)
+        self.gst_rate = Decimal(gst_rate)
+        self.amount = to_money(self.qty * self.rate)
+
+    def is_billable(self):
+        return bool(self.description) and self.qty > 0 and self.amount > 0
+
+
+class Invoice:
+    """Widget-independent invoice: line items plus running totals.
+
+    The subtotal and per-GST-rate taxable buckets are adjusted by the delta of
+    whichever item changed, so an edit costs O(1) however long the invoice is.
+    Listeners are called with the invoice after every change, or once at the
+    end of a batch().
+    """
+
+    def __init__(self):
+        self.items = []
+        self.subtotal = ZERO
+        self.taxable_by_rate = {}
+        self._listeners = []
+        self._batch_depth = 0
+        self._dirty = False
+
+    # --- Change notification ---
+    def subscribe(self, callback):
+        self._listeners.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        self._listeners.remove(callback)
+
+    def _notify(self):
+        if self._batch_depth:
+            self._dirty = True
+            return
+        self._dirty = False
+        for callback in self._listeners:
+            callback(self)
+
+    @contextmanager
+    def batch(self):
+        """Groups several changes so listeners are notified once, when the outermost batch ends."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._dirty:
+                self._notify()
+
+    # --- Running totals ---
+    def _apply(self, item, sign):
+        amount = item.amount if sign > 0 else -item.amount
+        self.subtotal += amount
+        bucket = self.taxable_by_rate.get(item.gst_rate, ZERO) + amount
+        if bucket:
+            self.taxable_by_rate[item.gst_rate] = bucket
+        else:
+            self.taxable_by_rate.pop(item.gst_rate, None)
+
+    # --- Item operations ---
+    def add_item(self, description="", size="", qty=0, rate=ZERO, gst_rate=DEFAULT_GST_RATE):
+        item = LineItem(description, size, qty, rate, gst_rate)
+        self.items.append(item)
+        self._apply(item, +1)
+        self._notify()
+        return item
+
+    def add_items(self, lines):
+        """Appends many (description, size, qty, rate, gst_rate) lines with a single notification."""
+        with self.batch():
+            return [self.add_item(*line) for line in lines]
+
+    def update_item(self, item, **fields):
+        """Changes any of description/size/qty/rate/gst_rate on an existing item.
+
+        The new amount is worked out before anything changes, so an invalid field
+        raises with the item and the running totals as they were.
+        """
+        for name in fields:
+            if name not in LineItem.__slots__ or name == "amount":
+                raise AttributeError(f"LineItem has no editable field {name!r}")
+        fields = {name: Decimal(value) if name in ("rate", "gst_rate") else value for name, value in fields.items()}
+        amount = to_money(fields.get("qty", item.qty) * fields.get("rate", item.rate))
+        self._apply(item, -1)
+        for name, value in fields.items():
+            setattr(item, name, value)
+        item.amount = amount
+        self._apply(item, +1)
+        self._notify()
+
+    def remove_item(self, item):
+        self.items.remove(item)
+        self._apply(item, -1)
+        self._notify()
+
+    def clear(self):
+        self.items.clear()
+        self.subtotal = ZERO
+        self.taxable_by_rate.clear()
+        self._notify()
+
+    def billable_items(self):
+        return [item for item in self.items if item.is_billable()]
+
+    def totals(self, interstate=False):
+        """Returns total_before_tax, cgst, sgst, igst and grand_total as Decimals, plus per-slab detail (see gst)."""
+        return compute_gst(self.taxable_by_rate, interstate)
+
+
+# --- Invoice snapshots ---
+# An invoice snapshot is a plain dict so it can be pickled to worker processes:
+#   {"company": <COMPANY_PROFILES key>, "date": "dd/mm/yyyy",
+#    "buyer": {<BUYER_FIELDS>: str}, "items": [{"description", "size", "qty", "rate"[, "hsn", "gst_rate"]}]}
+# plus "invoice_no" once the invoice has been saved to the invoice store.
+# qty and rate are kept as the text the operator typed, which is what the PDF shows.
+
+BUYER_FIELDS = ("name", "address", "gstin", "state", "state_code", "vehicle_no", "transport_mode", "driver_name")
+
+
+def buyer_block(data):
+    return {field: str(data["buyer"].get(field, "")) for field in BUYER_FIELDS}
+
+
+def snapshot_lines(items):
+    """(description, size, qty, rate, gst_rate) per snapshot item, treating unparsable qty/rate as zero like the UI does."""
+    for entry in items:
+        try:
+            qty, rate = parse_qty(entry.get("qty", "")), parse_rate(entry.get("rate", ""))
+        except (ValueError, TypeError):
+            qty, rate = 0, ZERO
+        gst_rate = entry.get("gst_rate")
+        # Only a missing rate means the default; 0 is a real (nil-rated) slab
+        yield entry.get("description", ""), entry.get("size", ""), qty, rate, DEFAULT_GST_RATE if gst_rate in (None, "") else gst_rate
+
+
+def invoice_interstate(data):
+    """Whether a snapshot is an inter-state (IGST) supply for its company profile."""
+    buyer = data.get("buyer", {})
+    return is_interstate(get_profile(data.get("company"))["gstin"], buyer.get("state_code", ""), buyer.get("gstin", ""))
+
+
+def invoice_from_data(data):
+    invoice = Invoice()
+    invoice.add_items(snapshot_lines(data.get("items", [])))
+    return invoice
+
+
+def _file_part(text):
+    # Buyer names like "M/s Sharma Traders" must not turn into subdirectories
+    return re.sub(r"[^\w.-]+", "_", text.strip()).strip("_.")
+
+
+def invoice_file_name(data):
+    buyer_name = _file_part(data["buyer"].get("name", "")) or "Invoice"
+    invoice_date_str = _file_part(data["date"].replace("/", "-"))
+    if data.get("invoice_no"):
+        return f"Invoice_{_file_part(data['invoice_no'].replace('/', '-'))}_{buyer_name}.pdf"
+    return f"Invoice_{buyer_name}_{invoice_date_str}.pdf"
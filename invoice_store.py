@@ -0,0 +1,199 @@
+import os
+import sqlite3
+from datetime import datetime
+from decimal import Decimal
+from billing_data import DEFAULT_COMPANY
+from invoice_model import BUYER_FIELDS, buyer_block, invoice_from_data, invoice_interstate
+from settings import STORE_BUSY_TIMEOUT_S, STORE_PATH, STORE_SHARED
+
+# --- Embedded invoice store ---
+# One SQLite file, in WAL mode on a single PC or with a rollback journal when several
+# counters share it over a network folder (see settings). Money is kept as integer
+# paise so sums stay exact; rates keep the operator's decimal text.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS invoices (
+    id INTEGER PRIMARY KEY,
+    invoice_no TEXT NOT NULL UNIQUE,
+    company TEXT NOT NULL,
+    financial_year TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    invoice_date TEXT NOT NULL,
+    buyer_name TEXT NOT NULL DEFAULT '',
+    buyer_address TEXT NOT NULL DEFAULT '',
+    buyer_gstin TEXT NOT NULL DEFAULT '',
+    buyer_state TEXT NOT NULL DEFAULT '',
+    buyer_state_code TEXT NOT NULL DEFAULT '',
+    vehicle_no TEXT NOT NULL DEFAULT '',
+    transport_mode TEXT NOT NULL DEFAULT '',
+    driver_name TEXT NOT NULL DEFAULT '',
+    total_before_tax INTEGER NOT NULL,
+    cgst INTEGER NOT NULL,
+    sgst INTEGER NOT NULL,
+    igst INTEGER NOT NULL,
+    grand_total INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    UNIQUE (company, financial_year, seq)
+);
+CREATE TABLE IF NOT EXISTS invoice_items (
+    invoice_id INTEGER NOT NULL REFERENCES invoices(id) ON DELETE CASCADE,
+    line_no INTEGER NOT NULL,
+    description TEXT NOT NULL,
+    size TEXT NOT NULL DEFAULT '',
+    qty TEXT NOT NULL DEFAULT '',
+    rate TEXT NOT NULL DEFAULT '',
+    gst_rate TEXT NOT NULL DEFAULT '5',
+    amount INTEGER NOT NULL,
+    PRIMARY KEY (invoice_id, line_no)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS invoice_sequences (
+    company TEXT NOT NULL,
+    financial_year TEXT NOT NULL,
+    last_seq INTEGER NOT NULL,
+    PRIMARY KEY (company, financial_year)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_invoices_date ON invoices (invoice_date);
+CREATE INDEX IF NOT EXISTS idx_invoices_buyer_gstin ON invoices (buyer_gstin, invoice_date);
+CREATE INDEX IF NOT EXISTS idx_invoices_buyer_name ON invoices (buyer_name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_invoices_company_date ON invoices (company, invoice_date);
+"""
+
+SUMMARY_COLUMNS = ("invoice_no", "company", "invoice_date", "buyer_name", "buyer_gstin", "grand_total")
+
+
+def to_paise(amount):
+    return int(Decimal(amount) * 100)
+
+
+def from_paise(paise):
+    return Decimal(paise) / 100
+
+
+def parse_invoice_date(text):
+    """'dd/mm/yyyy' as shown by the DateEntry -> ISO 'yyyy-mm-dd' for indexing and range queries."""
+    return datetime.strptime(text.strip(), "%d/%m/%Y").date().isoformat()
+
+
+def financial_year(iso_date):
+    """Indian financial year (April-March) of an ISO date, e.g. '2026-10-18' -> '2026-27'."""
+    year, month = int(iso_date[:4]), int(iso_date[5:7])
+    start = year if month >= 4 else year - 1
+    return f"{start}-{(start + 1) % 100:02d}"
+
+
+def company_prefix(company):
+    return "".join(word[0] for word in company.split() if word[:1].isalnum()).upper() or "INV"
+
+
+def connect(path, shared=STORE_SHARED, timeout=STORE_BUSY_TIMEOUT_S):
+    """Autocommit SQLite connection to a store file, set up for one PC or a shared folder."""
+    if path != ":memory:":
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+    conn.execute(f"PRAGMA journal_mode={'DELETE' if shared else 'WAL'}")
+    conn.execute(f"PRAGMA synchronous={'FULL' if shared else 'NORMAL'}")
+    conn.execute("PRAGMA foreign_keys=ON")
+    return conn
+
+
+class InvoiceStore:
+    """Queryable archive of issued invoices, numbered per company and financial year."""
+
+    def __init__(self, path=STORE_PATH, shared=STORE_SHARED):
+        self.path = path
+        self.conn = connect(path, shared)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- Writing ---
+    def _next_seq(self, company, fy):
+        row = self.conn.execute(
+            "INSERT INTO invoice_sequences (company, financial_year, last_seq) VALUES (?, ?, 1) "
+            "ON CONFLICT (company, financial_year) DO UPDATE SET last_seq = last_seq + 1 RETURNING last_seq",
+            (company, fy)).fetchone()
+        return row[0]
+
+    def save(self, data):
+        """Stores an invoice snapshot (see invoice_model) and returns its newly allocated invoice number.
+
+        The number is allocated in the same transaction as the insert, so numbers
+        have no gaps and are never reused. BEGIN IMMEDIATE takes the database write
+        lock before the sequence is read, so counters saving at the same moment
+        queue up behind each other instead of drawing the same number.
+        """
+        company = data.get("company") or DEFAULT_COMPANY
+        invoice_date = parse_invoice_date(data["date"])
+        fy = financial_year(invoice_date)
+        buyer = buyer_block(data)
+        invoice = invoice_from_data(data)
+        totals = invoice.totals(invoice_interstate(data))
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            seq = self._next_seq(company, fy)
+            invoice_no = f"{company_prefix(company)}/{fy}/{seq:05d}"
+            cursor = conn.execute(
+                "INSERT INTO invoices (invoice_no, company, financial_year, seq, invoice_date, buyer_name, buyer_address, "
+                "buyer_gstin, buyer_state, buyer_state_code, vehicle_no, transport_mode, driver_name, total_before_tax, "
+                "cgst, sgst, igst, grand_total, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (invoice_no, company, fy, seq, invoice_date, buyer["name"], buyer["address"], buyer["gstin"].upper(),
+                 buyer["state"], buyer["state_code"], buyer["vehicle_no"], buyer["transport_mode"], buyer["driver_name"],
+                 to_paise(totals["total_before_tax"]), to_paise(totals["cgst"]), to_paise(totals["sgst"]),
+                 to_paise(totals["igst"]), to_paise(totals["grand_total"]), datetime.now().isoformat(timespec="seconds")))
+            invoice_id = cursor.lastrowid
+            conn.executemany(
+                "INSERT INTO invoice_items (invoice_id, line_no, description, size, qty, rate, gst_rate, amount) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                ((invoice_id, line_no, item.description, item.size, str(entry.get("qty", "")), str(entry.get("rate", "")), str(item.gst_rate), to_paise(item.amount))
+                 for line_no, (entry, item) in enumerate(zip(data.get("items", []), invoice.items), 1) if item.description or item.amount))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return invoice_no
+
+    # --- Reading ---
+    def get(self, invoice_no):
+        """Returns the stored invoice as a snapshot dict (with invoice_no), or None."""
+        conn = self.conn
+        row = conn.execute(
+            "SELECT id, company, invoice_date, buyer_name, buyer_address, buyer_gstin, buyer_state, buyer_state_code, "
+            "vehicle_no, transport_mode, driver_name FROM invoices WHERE invoice_no = ?", (invoice_no,)).fetchone()
+        if row is None:
+            return None
+        invoice_id, company, invoice_date = row[:3]
+        items = conn.execute(
+            "SELECT description, size, qty, rate, gst_rate FROM invoice_items WHERE invoice_id = ? ORDER BY line_no", (invoice_id,)).fetchall()
+        return {
+            "invoice_no": invoice_no,
+            "company": company,
+            "date": datetime.strptime(invoice_date, "%Y-%m-%d").strftime("%d/%m/%Y"),
+            "buyer": dict(zip(BUYER_FIELDS, row[3:])),
+            "items": [{"description": d, "size": s, "qty": q, "rate": r, "gst_rate": g} for d, s, q, r, g in items],
+        }
+
+    def find(self, date_from=None, date_to=None, buyer_gstin=None, buyer_name=None, company=None, limit=100):
+        """Invoice summaries matching all given filters, newest first.
+
+        Dates are ISO 'yyyy-mm-dd' (inclusive); buyer_name matches as a case-insensitive prefix.
+        """
+        clauses, params = [], []
+        if date_from: clauses.append("invoice_date >= ?"); params.append(date_from)
+        if date_to: clauses.append("invoice_date <= ?"); params.append(date_to)
+        if buyer_gstin: clauses.append("buyer_gstin = ?"); params.append(buyer_gstin.upper())
+        if company: clauses.append("company = ?"); params.append(company)
+        if buyer_name:
+            # Range scan on the NOCASE index instead of LIKE, which SQLite cannot index here
+            clauses.append("buyer_name >= ? COLLATE NOCASE AND buyer_name < ? COLLATE NOCASE")
+            params.extend((buyer_name, buyer_name + "\U0010ffff"))
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        query = f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM invoices{where} ORDER BY invoice_date DESC, id DESC LIMIT ?"
+        rows = self.conn.execute(query, (*params, limit)).fetchall()
+        return [dict(zip(SUMMARY_COLUMNS, row[:-1]), grand_total=from_paise(row[-1])) for row in rows]
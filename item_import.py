@@ -0,0 +1,43 @@
+import csv
+import io
+
+# --- Bulk line items from a spreadsheet ---
+# Rows copied from Excel/LibreOffice reach the clipboard tab-separated; saved files
+# are usually CSV. Columns are taken in the grid's order (description, size, qty,
+# rate, then optionally hsn and gst_rate) unless the first row is a header naming
+# them, in which case any order works and unknown columns (S. No, Amount) are ignored.
+
+COLUMNS = ("description", "size", "qty", "rate", "hsn", "gst_rate")
+HEADER_NAMES = {
+    "description": "description", "description of goods": "description", "product": "description", "item": "description",
+    "size": "size", "qty": "qty", "quantity": "qty", "rate": "rate", "price": "rate",
+    "hsn": "hsn", "hsn code": "hsn", "hsn/sac": "hsn", "gst": "gst_rate", "gst rate": "gst_rate", "gst_rate": "gst_rate", "gst %": "gst_rate",
+}
+
+
+def parse_items(text):
+    """Snapshot items (see invoice_model) for tab-separated or CSV text; blank lines are skipped."""
+    dialect = "excel-tab" if "\t" in text else "excel"
+    # A quoted cell can span lines (Alt+Enter in Excel); grid entries and PDF rows are single-line
+    records = [[" ".join(cell.split()) for cell in record] for record in csv.reader(io.StringIO(text), dialect) if any(cell.strip() for cell in record)]
+    if not records:
+        return []
+    header = [HEADER_NAMES.get(cell.casefold().rstrip(":").strip()) for cell in records[0]]
+    columns = COLUMNS
+    if "description" in header:
+        columns, records = header, records[1:]
+    items = []
+    for record in records:
+        item = {"description": "", "size": "", "qty": "", "rate": "", "hsn": ""}
+        for column, cell in zip(columns, record):
+            if column: item[column] = cell
+        # Spreadsheets format numbers with grouping commas (1,23,456.00)
+        item["qty"], item["rate"] = item["qty"].replace(",", ""), item["rate"].replace(",", "")
+        if "gst_rate" in item: item["gst_rate"] = item["gst_rate"].rstrip("%").strip()
+        items.append(item)
+    return items
+
+
+def read_items(path):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return parse_items(f.read())
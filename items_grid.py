@@ -0,0 +1,193 @@
+import customtkinter as ctk
+from invoice_model import DEFAULT_GST_RATE
+
+# --- Virtualized line-item grid ---
+# Only as many rows of widgets as fit in the viewport are ever created. Scrolling
+# re-binds those widget rows to different entries of the plain `rows` data list,
+# so widget count and redraw cost stay flat however long the invoice gets.
+
+ROW_HEIGHT = 34
+COLUMN_WEIGHTS = [1, 5, 2, 2, 2, 3, 2]
+
+
+class RowData:
+    """One invoice line as the operator typed it, plus its invoice model item.
+
+    auto_rate is the rate last filled in from the product catalog, so a later
+    product/size change may replace it but never a rate the operator typed.
+    draft_id identifies the row in the draft journal.
+    """
+    __slots__ = ("description", "size", "qty", "rate", "item", "hsn", "gst_rate", "auto_rate", "draft_id")
+
+    def __init__(self, item, description="", size="", qty="", rate="", hsn="", gst_rate=DEFAULT_GST_RATE):
+        self.item = item
+        self.description, self.size, self.qty, self.rate = description, size, qty, rate
+        self.hsn, self.gst_rate, self.auto_rate, self.draft_id = hsn, gst_rate, None, None
+
+
+class RowWidgets:
+    """A recyclable row of widgets, bound to whichever RowData is scrolled into it."""
+
+    def __init__(self, grid, slot_index):
+        parent = grid.body
+        self.grid, self.row, self.index, self._binding, self.filtered = grid, None, -1, False, False
+        self.s_no_label = ctk.CTkLabel(parent, text="")
+        self.product_var = ctk.StringVar(); product_dropdown = ctk.CTkComboBox(parent, variable=self.product_var, values=grid.product_values)
+        self.size_var = ctk.StringVar(); size_dropdown = ctk.CTkComboBox(parent, variable=self.size_var, values=grid.size_values); size_dropdown.set("")
+        self.qty_entry = ctk.CTkEntry(parent, justify='right')
+        self.rate_entry = ctk.CTkEntry(parent, justify='right')
+        self.amount_label = ctk.CTkLabel(parent, text="0.00", anchor="e")
+        delete_button = ctk.CTkButton(parent, text="Delete", command=lambda: self.row and grid.on_delete(self.row), width=60, fg_color="#E74C3C", hover_color="#C0392B")
+        self.product_dropdown, self.size_dropdown = product_dropdown, size_dropdown
+        self.widgets = [self.s_no_label, product_dropdown, size_dropdown, self.qty_entry, self.rate_entry, self.amount_label, delete_button]
+        self.grid_options = [dict(padx=5), dict(padx=5, pady=2), dict(padx=5, pady=2), dict(padx=5, pady=2), dict(padx=5, pady=2), dict(padx=10, pady=2), dict(padx=5, pady=2)]
+        for column, (widget, options) in enumerate(zip(self.widgets, self.grid_options)):
+            widget.grid(row=slot_index, column=column, sticky='ew' if column != 6 else '', **options)
+        self.product_var.trace_add("write", lambda *_: self._store("description", self.product_var.get()) and grid.product_changed(self))
+        self.size_var.trace_add("write", lambda *_: self._store("size", self.size_var.get()) and grid.size_changed(self))
+        self.qty_entry.bind("<KeyRelease>", lambda event: self._edited("qty", self.qty_entry.get()))
+        self.rate_entry.bind("<KeyRelease>", lambda event: self._edited("rate", self.rate_entry.get()))
+        for widget in self.widgets:
+            grid.bind_wheel(widget)
+
+    def _store(self, field, value):
+        if self.row is None or self._binding:
+            return False
+        if getattr(self.row, field) == value:
+            return False
+        setattr(self.row, field, value)
+        return True
+
+    def _edited(self, field, value):
+        if self._store(field, value):
+            self.grid.on_edit(self.row)
+
+    def bind(self, index, row):
+        self._binding = True
+        try:
+            self.row, self.index = row, index
+            self.s_no_label.configure(text=str(index + 1))
+            if self.grid.catalog is not None: self.grid.filter_choices(self, reset=True)
+            self.product_var.set(row.description)
+            self.size_var.set(row.size)
+            for entry, text in ((self.qty_entry, row.qty), (self.rate_entry, row.rate)):
+                if entry.get() != text:
+                    entry.delete(0, ctk.END); entry.insert(0, text)
+            self.show_amount()
+        finally:
+            self._binding = False
+
+    def show_amount(self):
+        self.amount_label.configure(text=f"{self.row.item.amount:.2f}")
+
+    def show(self, visible):
+        for widget in self.widgets:
+            if visible: widget.grid()
+            else: widget.grid_remove()
+        if not visible:
+            self.row, self.index = None, -1
+
+
+class VirtualItemsGrid(ctk.CTkFrame):
+    """Scrollable items view over `rows` (a list of RowData) that recycles a fixed pool of RowWidgets."""
+
+    def __init__(self, parent, rows, on_edit, on_delete, product_values, size_values, catalog=None, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.rows, self.on_edit, self.on_delete, self.catalog = rows, on_edit, on_delete, catalog
+        self.product_values, self.size_values = product_values, size_values
+        self.slots, self.top = [], 0
+        self.grid_columnconfigure(0, weight=1); self.grid_rowconfigure(0, weight=1)
+        self.body = ctk.CTkFrame(self, fg_color="transparent"); self.body.grid(row=0, column=0, sticky='nsew')
+        self.body.grid_propagate(False)
+        for i, weight in enumerate(COLUMN_WEIGHTS): self.body.grid_columnconfigure(i, weight=weight)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.yview); self.scrollbar.grid(row=0, column=1, sticky='ns')
+        self.body.bind("<Configure>", lambda event: self._resize(event.height))
+        self.bind_wheel(self.body)
+
+    # --- Viewport ---
+    def visible_count(self):
+        return max(1, self.body.winfo_height() // ROW_HEIGHT)
+
+    def _resize(self, height):
+        needed = max(1, height // ROW_HEIGHT)
+        while len(self.slots) < needed:
+            self.body.grid_rowconfigure(len(self.slots), minsize=ROW_HEIGHT)
+            self.slots.append(RowWidgets(self, len(self.slots)))
+        self.refresh()
+
+    def refresh(self):
+        """Re-binds the visible slots after rows were added, removed or reordered."""
+        visible = min(len(self.slots), self.visible_count())
+        self.top = max(0, min(self.top, len(self.rows) - visible))
+        for i, slot in enumerate(self.slots):
+            index = self.top + i
+            if i < visible and index < len(self.rows):
+                slot.bind(index, self.rows[index]); slot.show(True)
+            else:
+                slot.show(False)
+        total = max(len(self.rows), 1)
+        self.scrollbar.set(self.top / total, min(1.0, (self.top + visible) / total))
+
+    def update_row(self, row):
+        """Repaints one row's amount if it is on screen; off-screen rows cost nothing."""
+        for slot in self.slots:
+            if slot.row is row:
+                slot.show_amount()
+                return
+
+    def scroll_to(self, index):
+        visible = self.visible_count()
+        if index < self.top: self.top = index
+        elif index >= self.top + visible: self.top = index - visible + 1
+        self.refresh()
+
+    # --- Product catalog: type-ahead and rate auto-fill ---
+    def filter_choices(self, slot, reset=False):
+        """Narrows the description dropdown to catalog matches of the typed text, and sizes to that product's."""
+        description = slot.row.description
+        if description and not reset:
+            slot.product_dropdown.configure(values=self.catalog.search(description) or self.product_values); slot.filtered = True
+        elif slot.filtered:
+            slot.product_dropdown.configure(values=self.product_values); slot.filtered = False
+        slot.size_dropdown.configure(values=self.catalog.sizes_for(description) or self.size_values)
+
+    def product_changed(self, slot):
+        if self.catalog is not None:
+            self.filter_choices(slot)
+            self.autofill_rate(slot)
+        self.on_edit(slot.row)
+
+    def size_changed(self, slot):
+        self.autofill_rate(slot)
+        self.on_edit(slot.row)
+
+    def autofill_rate(self, slot):
+        row = slot.row
+        entry = self.catalog.lookup(row.description, row.size) if self.catalog is not None else None
+        # HSN and GST slab always follow the product, even when the operator typed the rate;
+        # a product the catalog doesn't know gets none rather than the previous product's
+        product = entry or self.product_entry(row.description)
+        row.hsn, row.gst_rate = (product.hsn, product.gst_rate) if product is not None else ("", DEFAULT_GST_RATE)
+        if entry is None or entry.rate is None or (row.rate and row.rate != row.auto_rate):
+            return
+        row.rate = row.auto_rate = str(entry.rate)
+        slot.rate_entry.delete(0, ctk.END); slot.rate_entry.insert(0, row.rate)
+
+    def product_entry(self, description):
+        """Any catalog entry of the product, for its HSN and slab before a size is picked."""
+        sizes = self.catalog.sizes_for(description) if self.catalog is not None else []
+        return self.catalog.lookup(description, sizes[0]) if sizes else None
+
+    # --- Scrolling ---
+    def yview(self, action, amount, unit=None):
+        visible = self.visible_count()
+        if action == "moveto":
+            self.top = int(float(amount) * len(self.rows))
+        elif action == "scroll":
+            self.top += int(amount) * (visible if unit == "pages" else 1)
+        self.refresh()
+
+    def bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", lambda event: self.yview("scroll", -1 if event.delta > 0 else 1, "units"), add="+")
+        widget.bind("<Button-4>", lambda event: self.yview("scroll", -1, "units"), add="+")
+        widget.bind("<Button-5>", lambda event: self.yview("scroll", 1, "units"), add="+")
@@ -0,0 +1,240 @@
+"""Imports invoices saved as text files by the old Tk app (myfile.py, Save to File).
+
+Each .txt file is parsed back into an invoice snapshot (see invoice_model) and
+written as one JSONL line, the input format of batch_invoices.py; --store also
+archives them in the invoice store. Files are parsed in worker processes, and
+malformed ones are reported and skipped. Usage:
+
+    python legacy_import.py old_invoices/ [more dirs or files] --out legacy.jsonl [--errors errors.csv] [--store]
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from decimal import Decimal, InvalidOperation
+from billing_data import COMPANY_PROFILES, DEFAULT_COMPANY
+from invoice_model import BUYER_FIELDS, invoice_from_data
+
+BATCH_FILES = 256
+MAX_FILE_BYTES = 1 << 20  # a legacy invoice is a few KB; anything this big is not one
+
+# --- Layout written by save_to_file ---
+HEADER_PATTERNS = [
+    re.compile(r"GSTIN\.\s*:\s*(?P<company_gstin>\S*)"),
+    re.compile(r"\s*Dated\s*:\s*(?P<date>\S+)"),
+    re.compile(r"Buyer's Name\s*:\s?(?P<name>.*?)\s*$"),
+    re.compile(r"Address\s*:\s?(?P<address>.*?)\s*$"),
+    re.compile(r"GSTIN/Unique ID\s*:\s?(?P<gstin>.*?)\s+State\s*:\s?(?P<state>.*?)\s+State Code\s*:\s?(?P<state_code>.*?)\s*$"),
+    re.compile(r"Vehicle No\s*:\s?(?P<vehicle_no>.*?)\s+Mode of Transport\s*:\s?(?P<transport_mode>.*?)\s+Driver Name\s*:\s?(?P<driver_name>.*?)\s*$"),
+]
+TABLE_HEADING = re.compile(r"S\.No\s+Description of Goods\s+Quantity\s+Rate\s+Amount\s*$")
+# The description column is padded to 30 but may be longer, so columns are taken from both ends
+ITEM_ROW = re.compile(r"(?P<s_no>\d+)\s+(?P<description>.*?)\s+(?P<qty>\S+)\s+(?P<rate>\S+)\s+(?P<amount>\S+)\s*$")
+TOTAL_BEFORE_TAX = re.compile(r"Total Amount \(Before Tax\)\s*:\s*(?P<value>\S+)")
+GRAND_TOTAL = re.compile(r"Grand Total\s*:\s*(?P<value>\S+)")
+DATE = re.compile(r"\d{2}/\d{2}/\d{4}$")
+REQUIRED_FIELDS = {"date": "Dated", "name": "Buyer's Name"}
+
+
+class LegacyFormatError(ValueError):
+    def __init__(self, message, line_no=None):
+        super().__init__(f"line {line_no}: {message}" if line_no else message)
+        self.message, self.line_no = message, line_no
+
+    def __reduce__(self):  # keep line_no when sent back from a worker process
+        return LegacyFormatError, (self.message, self.line_no)
+
+
+def _decimal(text, what, line_no):
+    try:
+        return Decimal(text)
+    except InvalidOperation:
+        raise LegacyFormatError(f"invalid {what} {text!r}", line_no)
+
+
+def parse_legacy_invoice(text, source=""):
+    """Snapshot dict for the text of one saved invoice; raises LegacyFormatError if it is not one."""
+    lines = text.splitlines()
+    fields, company, n = {}, None, 0
+    for n, line in enumerate(lines, 1):
+        if TABLE_HEADING.match(line):
+            break
+        if company is None and line.strip() in COMPANY_PROFILES:
+            company = line.strip()
+            continue
+        for pattern in HEADER_PATTERNS:
+            match = pattern.match(line)
+            if match:
+                fields.update(match.groupdict())
+                break
+    else:
+        raise LegacyFormatError("no 'S.No / Description of Goods' item table")
+    for field, label in REQUIRED_FIELDS.items():
+        if field not in fields:
+            raise LegacyFormatError(f"missing '{label}' line")
+    if not DATE.match(fields["date"]):
+        raise LegacyFormatError(f"invalid date {fields['date']!r}")
+    if company is None:
+        company = next((name for name, profile in COMPANY_PROFILES.items() if profile["gstin"] == fields.get("company_gstin")), DEFAULT_COMPANY)
+
+    i = n  # index of the line after the table heading
+    while i < len(lines) and lines[i].startswith("-"):
+        i += 1
+    items, written_amounts = [], []
+    while i < len(lines) and lines[i].strip() and not TOTAL_BEFORE_TAX.match(lines[i]):
+        row = lines[i].strip()
+        i += 1
+        match = ITEM_ROW.match(row)
+        if not match or int(match["s_no"]) != len(items) + 1:
+            raise LegacyFormatError(f"unreadable item row {row!r}", i)
+        items.append({"description": match["description"], "size": "", "qty": match["qty"], "rate": match["rate"]})
+        written_amounts.append((_decimal(match["amount"], "amount", i), i))
+    total_before_tax = grand_total = None
+    for line_no, line in enumerate(lines[i:], i + 1):
+        match = TOTAL_BEFORE_TAX.match(line)
+        if match:
+            total_before_tax = (_decimal(match["value"], "total", line_no), line_no)
+        match = GRAND_TOTAL.match(line)
+        if match:
+            grand_total = _decimal(match["value"], "grand total", line_no)
+    if total_before_tax is None:
+        raise LegacyFormatError("missing 'Total Amount (Before Tax)' line")
+    data = _finish(company, fields, items, written_amounts, total_before_tax, source)
+    if grand_total is not None:
+        data["legacy_grand_total"] = str(grand_total)
+    return data
+
+
+def _finish(company, fields, items, written_amounts, total_before_tax, source):
+    """Builds the snapshot and checks the written amounts against the invoice model's."""
+    data = {"company": company, "date": fields["date"], "buyer": {field: fields.get(field, "") for field in BUYER_FIELDS}, "items": items}
+    invoice = invoice_from_data(data)
+    for item, (written, line_no) in zip(invoice.items, written_amounts):
+        if item.amount != written:
+            raise LegacyFormatError(f"amount {written} is not qty x rate ({item.amount})", line_no)
+    if total_before_tax[0] != invoice.subtotal:
+        raise LegacyFormatError(f"total {total_before_tax[0]} does not match the items ({invoice.subtotal})", total_before_tax[1])
+    if source:
+        data["source"] = source
+    return data
+
+
+def read_text(path):
+    with open(path, "rb") as f:
+        raw = f.read(MAX_FILE_BYTES + 1)
+    if len(raw) > MAX_FILE_BYTES:
+        raise LegacyFormatError(f"larger than {MAX_FILE_BYTES} bytes")
+    try:
+        return raw.decode("utf-8")
+    except UnicodeDecodeError:
+        return raw.decode("cp1252", errors="replace")  # the Windows default the old app wrote with
+
+
+# --- Parallel import ---
+def parse_batch(paths):
+    """[(path, snapshot or None, error or None)] for a batch of files; runs in a worker process."""
+    results = []
+    for path in paths:
+        try:
+            results.append((path, parse_legacy_invoice(read_text(path), path), None))
+        except (OSError, ValueError) as e:
+            results.append((path, None, e))
+    return results
+
+
+def iter_files(paths):
+    """Every .txt file under the given files/directories, read from the directory entries as they are walked."""
+    stack = list(reversed(paths))
+    while stack:
+        path = stack.pop()
+        if not os.path.isdir(path):
+            yield path
+            continue
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    stack.append(entry.path)
+                elif entry.name.lower().endswith(".txt"):
+                    yield entry.path
+
+
+def iter_batches(items, size=BATCH_FILES):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def import_files(paths, workers=None):
+    """Yields (path, snapshot or None, error or None) for every file, parsing batches across processes.
+
+    Only a few batches per worker are in flight at once, so memory stays flat
+    however many files there are. Results come in completion order.
+    """
+    workers = workers or os.cpu_count() or 1
+    batches = iter_batches(iter_files(paths))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        while True:
+            for batch in batches:
+                pending.add(pool.submit(parse_batch, batch))
+                if len(pending) >= workers * 4:
+                    break
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+
+def run_import(paths, out_path, errors_path=None, store_path=None, workers=None):
+    start = time.perf_counter()
+    imported = failed = 0
+    store = None
+    if store_path:
+        from invoice_store import InvoiceStore
+        store = InvoiceStore(store_path)
+    with open(out_path, "w", encoding="utf-8") as out, open(errors_path or os.devnull, "w", newline="", encoding="utf-8") as err:
+        errors = csv.writer(err)
+        errors.writerow(("file", "line", "error"))
+        for path, data, error in import_files(paths, workers):
+            if error is None and store:
+                try:
+                    store.save(data)
+                except ValueError as e:
+                    error = e
+            if error is None:
+                out.write(json.dumps(data, ensure_ascii=False) + "\n")
+                imported += 1
+            else:
+                failed += 1
+                errors.writerow((path, getattr(error, "line_no", None) or "", str(error)))
+                if not errors_path: print(f"Skipped {path}: {error}", file=sys.stderr)
+    if store: store.close()
+    elapsed = time.perf_counter() - start
+    rate = (imported + failed) / elapsed if elapsed else 0.0
+    print(f"Imported {imported} invoices, skipped {failed} malformed files in {elapsed:.2f}s ({rate:.0f} files/s)")
+    return imported, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import invoices saved as .txt by the old billing app.")
+    parser.add_argument("paths", nargs="+", help=".txt files or directories to search recursively")
+    parser.add_argument("--out", default="legacy_invoices.jsonl", help="JSONL file of invoice snapshots to write")
+    parser.add_argument("--errors", default=None, help="CSV report of malformed files (default: print them)")
+    parser.add_argument("--store", default=None, metavar="DB", help="also archive the invoices in this invoice store, e.g. the app's invoices.db")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    args = parser.parse_args(argv)
+    run_import(args.paths, args.out, args.errors, args.store, args.workers)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
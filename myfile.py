@@ -2,6 +2,7 @@ import tkinter as tk
 from tkinter import ttk, filedialog
 from num2words import num2words
 from tkcalendar import DateEntry  # Import DateEntry from tkcalendar
+from invoice_model import Invoice, parse_qty, parse_rate
 
 # Function to convert the number to Indian currency words
 def convert_to_indian_currency_words(amount):
@@ -14,29 +15,26 @@ def convert_to_indian_currency_words(amount):
 # Function to calculate the amount for a row
 def calculate_row(row_frame):
     try:
-        qty = int(row_frame.qty_entry.get())
-        rate = float(row_frame.rate_entry.get())
-        row_frame.amount_label.config(text=f"{qty * rate:.2f}")
+        qty = parse_qty(row_frame.qty_entry.get())
+        rate = parse_rate(row_frame.rate_entry.get())
     except ValueError:
-        row_frame.amount_label.config(text="0.00")
-    calculate_total()  # Dynamically update the total whenever a row changes
+        qty, rate = 0, 0
+    # The invoice model updates its running totals and calls calculate_total
+    invoice.update_item(row_frame.item, description=row_frame.product_var.get(), qty=qty, rate=rate)
+    row_frame.amount_label.config(text=f"{row_frame.item.amount:.2f}")
 
 # Function to calculate the total amount
 def calculate_total():
-    total_before_tax = 0
-    for row in rows:
-        try:
-            total_before_tax += float(row.amount_label.cget("text"))
-        except ValueError:
-            pass
+    totals = invoice.totals()
+    total_before_tax = totals['total_before_tax']
 
     # Update total amount before tax
     total_label.config(text=f"Total Amount (Before Tax) : {total_before_tax:.2f}")
 
-    # Calculate taxes
-    cgst = total_before_tax * 0.025
-    sgst = total_before_tax * 0.025
-    igst = total_before_tax * 0.00
+    # Taxes come from the invoice model's running totals
+    cgst = totals['cgst']
+    sgst = totals['sgst']
+    igst = totals['igst']
 
     # Update taxes dynamically
     cgst_label.config(text=f"CGST @ 2.5%                 : {cgst:.2f}")
@@ -44,7 +42,7 @@ def calculate_total():
     igst_label.config(text=f"IGST @ 0%                     : {igst:.2f}")
 
     # Calculate grand total
-    grand_total = total_before_tax + cgst + sgst + igst
+    grand_total = totals['grand_total']
     grand_total_label.config(text=f"Grand Total  : {grand_total:.2f}")
     
     # Convert grand total to integer (rounded) before converting to words
@@ -59,7 +57,7 @@ def delete_row(row_frame):
     row_frame.destroy()
     rows.remove(row_frame)
     reindex_rows()  # Re-index rows after deletion
-    calculate_total()  # Recalculate total after row deletion
+    invoice.remove_item(row_frame.item)  # Totals are recalculated by the model
 
 # Function to add a new row
 def add_row():
@@ -110,6 +108,7 @@ def add_row():
     delete_button = tk.Button(row_frame, text="Delete", command=lambda: delete_row(row_frame))
     delete_button.grid(row=0, column=5, padx=5)
 
+    row_frame.item = invoice.add_item(qty=1)
     rows.append(row_frame)
     reindex_rows()  # Re-index rows after adding a new row
 
@@ -140,9 +139,9 @@ def reset():
     for row in rows:
         row.destroy()
     rows.clear()
+    invoice.clear()
     for _ in range(5):
         add_row()
-    calculate_total()
 
 # Function to save filled rows to a text file with a user-specified path
 def save_to_file():
@@ -292,6 +291,7 @@ rows_frame = tk.Frame(root)
 rows_frame.grid(row=2, column=0, sticky='ew', padx=10)
 
 rows = []
+invoice = Invoice()
 for _ in range(5):
     add_row()
 
@@ -325,4 +325,7 @@ grand_total_label.grid(row=8, column=0, sticky='w', padx=10, pady=10)
 invoice_amount_in_words_label = tk.Label(root, text="Invoice Amount in Words: Zero Only", font=("Arial", 10))
 invoice_amount_in_words_label.grid(row=9, column=0, sticky='w', padx=10, pady=5)
 
+# Labels exist now, so the totals can follow the invoice model from here on
+invoice.subscribe(lambda _invoice: calculate_total())
+
 root.mainloop()
@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+import threading
+from decimal import Decimal, InvalidOperation
+from billing_data import get_profile
+from invoice_model import DEFAULT_GST_RATE, buyer_block, invoice_file_name
+from settings import PDF_CACHE_DIR, PDF_CACHE_MAX_MB
+
+# --- Content-addressed PDF cache ---
+# A rendered invoice is stored under a hash of everything that shows on the page:
+# the normalized snapshot, the company profile and the layout version. Reprinting
+# an unchanged invoice is then a file lookup, and two different invoices can never
+# share a file. Hits refresh the file's mtime; when the cache outgrows its limit the
+# least recently used files are deleted. Several processes may share the directory:
+# files appear atomically via os.replace and eviction re-reads the directory.
+
+EVICT_TO = 0.9  # evict down to this fraction of the limit, so eviction does not run on every store
+
+
+def _rate_text(value):
+    try:
+        return f"{Decimal(str(DEFAULT_GST_RATE if value in (None, '') else value)).normalize():f}"
+    except InvalidOperation:
+        return str(value)
+
+
+def normalize(data):
+    """The parts of an invoice snapshot that affect its PDF, in a canonical form."""
+    items = [[str(entry.get(field, "")) for field in ("description", "size", "qty", "rate")] + [_rate_text(entry.get("gst_rate"))]
+             for entry in data.get("items", [])]
+    return {
+        "company": data.get("company") or "",
+        "invoice_no": data.get("invoice_no") or "",
+        "date": data["date"],
+        "buyer": buyer_block(data),
+        "items": [item for item in items if any(item[:4])],
+    }
+
+
+def content_key(data, pagesize=None):
+    from pdf_invoice import LAYOUT_VERSION
+    from reportlab.lib.pagesizes import A4
+    document = [LAYOUT_VERSION, [round(x, 2) for x in (pagesize or A4)], get_profile(data.get("company")), normalize(data)]
+    return hashlib.sha256(json.dumps(document, sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+
+
+class PdfCache:
+    def __init__(self, directory=PDF_CACHE_DIR, max_bytes=PDF_CACHE_MAX_MB << 20):
+        self.directory, self.max_bytes = directory, max_bytes
+        self._size = None  # bytes in the cache, counted on first store
+        self._lock = threading.Lock()
+
+    def path_for(self, data, pagesize=None):
+        """Where this invoice's PDF lives in the cache: its usual file name plus a content hash."""
+        stem, ext = os.path.splitext(invoice_file_name(data))
+        return os.path.join(self.directory, f"{stem}_{content_key(data, pagesize)[:20]}{ext}")
+
+    def get(self, data, pagesize=None):
+        """Path of the cached PDF for data, or None."""
+        path = self.path_for(data, pagesize)
+        try:
+            os.utime(path)  # most recently used
+        except FileNotFoundError:
+            return None
+        return path
+
+    def render(self, data, pagesize=None, progress=None):
+        """Path of data's PDF, rendering it into the cache first unless it is already there."""
+        from pdf_invoice import build_invoice_pdf
+        from reportlab.lib.pagesizes import A4
+        path = self.get(data, pagesize)
+        if path:
+            return path
+        path = self.path_for(data, pagesize)
+        os.makedirs(self.directory, exist_ok=True)
+        part_path = f"{path}.{os.getpid()}.{threading.get_ident()}.part"
+        try:
+            build_invoice_pdf(data, part_path, pagesize or A4, progress=progress)
+            os.replace(part_path, path)
+        except BaseException:
+            if os.path.exists(part_path): os.remove(part_path)
+            raise
+        self._added(path)
+        return path
+
+    # --- Size limit ---
+    def _entries(self):
+        found = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(".pdf") and entry.is_file():
+                    stat = entry.stat()
+                    found.append((stat.st_mtime, stat.st_size, entry.path))
+        return found
+
+    def _added(self, new_path):
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._entries())
+            else:
+                self._size += os.path.getsize(new_path)
+            if self._size > self.max_bytes:
+                self._evict(keep=new_path)
+
+    def _evict(self, keep):
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes * EVICT_TO:
+                break
+            if path == keep:
+                continue  # the file about to be opened
+            try:
+                os.remove(path)
+            except OSError:
+                continue  # already evicted by another process, or open in a viewer on Windows
+            total -= size
+        self._size = total
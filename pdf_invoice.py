@@ -0,0 +1,173 @@
+from functools import lru_cache
+from xml.sax.saxutils import escape
+from reportlab.lib.pagesizes import A4
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Flowable
+from reportlab.lib.units import inch
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from billing_data import get_profile
+from invoice_model import ZERO, buyer_block, invoice_from_data, invoice_interstate
+from gst import tax_labels
+from amount_words import convert_to_indian_currency_words
+
+
+# Bump whenever the rendered layout changes, so cached PDFs (see pdf_cache) are re-rendered
+LAYOUT_VERSION = 2
+
+ITEM_HEADER = ['S.No', 'Description', 'Size', 'Qty', 'Rate', 'Amount']
+ITEM_COLUMN_WIDTHS = [0.5*inch, 2.7*inch, 0.8*inch, 0.8*inch, 1*inch, 1.2*inch]
+# Fixed row heights (what reportlab measures for the items table's font and padding),
+# so page capacity is known without laying rows out
+HEADER_ROW_HEIGHT = 27
+ITEM_ROW_HEIGHT = 18
+# Room for text in the description and size cells once padding is taken off
+DESCRIPTION_TEXT_WIDTH = ITEM_COLUMN_WIDTHS[1] - 11
+SIZE_TEXT_WIDTH = ITEM_COLUMN_WIDTHS[2] - 12
+
+
+def fit_text(text, width, font="Helvetica", size=10):
+    """text on one line, cut with an ellipsis so it fits in width points; item rows have a fixed height."""
+    text = " ".join(str(text).split())
+    if stringWidth(text, font, size) <= width:
+        return text
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if stringWidth(text[:mid].rstrip() + "\u2026", font, size) <= width: lo = mid
+        else: hi = mid - 1
+    return text[:lo].rstrip() + "\u2026"
+
+
+class InvoiceTemplate:
+    """Everything in the invoice layout that depends only on the company and page size.
+
+    Only styles and markup are kept: flowables carry per-document layout state, so
+    build_invoice_pdf makes fresh Paragraphs from this markup for every render.
+    """
+
+    def __init__(self, profile, pagesize):
+        self.profile, self.pagesize = profile, pagesize
+        styles = getSampleStyleSheet()
+        self.title_style = ParagraphStyle('CustomTitle', parent=styles['Heading1'], fontSize=16, spaceAfter=20, alignment=1, textColor=colors.HexColor("#000080"))
+        self.normal_style = ParagraphStyle(name='Normal_Para', parent=styles['Normal'], fontSize=10, leading=14)
+
+        # --- Use the profile data to build the header string ---
+        company_info = f"""
+        <para align=center>
+            <b>{escape(profile['name'])}</b><br/>
+            {escape(profile['address'])}<br/>
+            GSTIN: {escape(profile['gstin'])}     Mob: {escape(profile['phone'])}<br/>
+            <font size=14><b>TAX INVOICE</b></font>
+        </para>
+        """
+        self.header_markup = company_info
+        self.buyer_table_style = TableStyle([('VALIGN', (0, 0), (-1, -1), 'TOP'), ('LEFTPADDING', (0, 0), (-1, -1), 5), ('SPAN', (1, 0), (2, 0)), ('SPAN', (1, 1), (2, 1)), ('SPAN', (1, 2), (2, 2)), ('SPAN', (1, 3), (2, 3)), ('SPAN', (1, 5), (2, 5)), ('SPAN', (1, 6), (2, 6)), ('SPAN', (1, 7), (2, 7)), ('GRID', (0, 3), (-1, 7), 0.5, colors.grey)])
+        self.items_table_style = TableStyle([('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#4a4a4a")),('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),('ALIGN', (0, 0), (-1, -1), 'CENTER'),('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),('BOTTOMPADDING', (0, 0), (-1, 0), 12),('BACKGROUND', (0, 1), (-1, -1), colors.HexColor("#f0f0f0")),('GRID', (0, 0), (-1, -1), 1, colors.black),('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),('ALIGN', (1, 1), (1, -1), 'LEFT'),('ALIGN', (3, 1), (-1, -1), 'RIGHT'),('LEFTPADDING', (1, 1), (1, -1), 5),('RIGHTPADDING', (3, 1), (-1, -1), 10)])
+        self.forward_row_style = [('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'), ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#d9d9d9"))]
+        self.totals_table_style = TableStyle([('ALIGN', (0, 0), (-1, -1), 'RIGHT'), ('LINEABOVE', (0, -1), (-1, -1), 1, colors.black), ('LINEBELOW', (0, -1), (-1, -1), 1, colors.black)])
+        self.signature_markup = f"For {escape(profile['name'])}"
+
+
+@lru_cache(maxsize=None)
+def get_template(company, pagesize=A4):
+    """Returns the process-wide InvoiceTemplate for a COMPANY_PROFILES key and page size."""
+    return InvoiceTemplate(get_profile(company), tuple(pagesize))
+
+
+class ItemRowsFlowable(Flowable):
+    """The line-item table, laid out one page at a time.
+
+    Each split turns only the rows that fit in the space left on the page into a
+    Table, with the header repeated and Brought/Carried Forward subtotals, so layout
+    cost is linear in the number of lines and only one page of cells exists at once.
+    rows are the item table rows and amounts the matching line amounts.
+    """
+
+    def __init__(self, template, rows, amounts, start=0, brought_forward=ZERO):
+        Flowable.__init__(self)
+        self.template, self.rows, self.amounts = template, rows, amounts
+        self.start, self.brought_forward = start, brought_forward
+        self.width, self.hAlign, self._table = sum(ITEM_COLUMN_WIDTHS), 'CENTER', None
+
+    def _height(self, lines, carried):
+        return HEADER_ROW_HEIGHT + (lines + bool(self.start) + carried) * ITEM_ROW_HEIGHT
+
+    def _page_table(self, end, carried_forward=None):
+        data, forward_rows = [ITEM_HEADER], []
+        if self.start:
+            forward_rows.append(len(data)); data.append(['', 'Brought Forward', '', '', '', f"{self.brought_forward:.2f}"])
+        data.extend(self.rows[self.start:end])
+        if carried_forward is not None:
+            forward_rows.append(len(data)); data.append(['', 'Carried Forward', '', '', '', f"{carried_forward:.2f}"])
+        table = Table(data, colWidths=ITEM_COLUMN_WIDTHS, rowHeights=[HEADER_ROW_HEIGHT] + [ITEM_ROW_HEIGHT] * (len(data) - 1))
+        table.setStyle(self.template.items_table_style)
+        table.setStyle(TableStyle([(command, (c0, r0 + row), (c1, r1 + row), *values)
+                                   for row in forward_rows for command, (c0, r0), (c1, r1), *values in self.template.forward_row_style]))
+        return table
+
+    def wrap(self, availWidth, availHeight):
+        self.height = self._height(len(self.rows) - self.start, False)
+        if self.height <= availHeight:
+            self._table = self._page_table(len(self.rows))
+            self._table.wrap(availWidth, availHeight)
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        fit = int((availHeight - self._height(0, True)) // ITEM_ROW_HEIGHT)
+        if fit <= 0:
+            return []
+        end = self.start + fit
+        carried = self.brought_forward + sum(self.amounts[self.start:end], ZERO)
+        return [self._page_table(end, carried), ItemRowsFlowable(self.template, self.rows, self.amounts, end, carried)]
+
+    def draw(self):
+        self._table.drawOn(self.canv, 0, 0)
+
+
+def build_invoice_pdf(data, pdf_path, pagesize=A4, progress=None):
+    """Renders one invoice snapshot to pdf_path with the layout of the Generate PDF Invoice button.
+
+    progress, if given, is reportlab's progress callback: progress(kind, value).
+    """
+    template = get_template(data.get("company"), tuple(pagesize))
+    normal_style = template.normal_style
+    buyer = {field: escape(value) for field, value in buyer_block(data).items()}  # Paragraph text is markup
+    invoice = invoice_from_data(data)
+    totals = invoice.totals(invoice_interstate(data))
+    cgst_caption, sgst_caption, igst_caption = tax_labels(totals)
+    total_before_tax, cgst, sgst, igst, grand_total = totals['total_before_tax'], totals['cgst'], totals['sgst'], totals['igst'], totals['grand_total']
+    grand_total_in_words = convert_to_indian_currency_words(grand_total)
+    doc = SimpleDocTemplate(pdf_path, pagesize=template.pagesize, rightMargin=30, leftMargin=30, topMargin=30, bottomMargin=30)
+    if progress: doc.setProgressCallBack(progress)
+    elements = []
+    elements.append(Paragraph(template.header_markup, template.title_style)); elements.append(Spacer(1, 15))
+    if data.get("invoice_no"):
+        elements.append(Paragraph(f"<b>Invoice No:</b> {escape(data['invoice_no'])}", normal_style)); elements.append(Spacer(1, 5))
+    buyer_info_data = [
+        [Paragraph("<b>Date:</b>", normal_style), Paragraph(escape(data["date"]), normal_style), ""],
+        [Paragraph("<b>Buyer's Name:</b>", normal_style), Paragraph(buyer["name"], normal_style), ""],
+        [Paragraph("<b>Address:</b>", normal_style), Paragraph(buyer["address"], normal_style), ""],
+        [Paragraph(f"<b>GSTIN/Unique ID:</b>", normal_style), Paragraph(buyer["gstin"], normal_style), ""],
+        [Paragraph(f"<b>State:</b>", normal_style), Paragraph(buyer["state"], normal_style), Paragraph(f"<b>State Code:</b> {buyer['state_code']}", normal_style)],
+        [Paragraph(f"<b>Vehicle No:</b>", normal_style), Paragraph(buyer["vehicle_no"], normal_style), ""],
+        [Paragraph(f"<b>Mode of Transport:</b>", normal_style), Paragraph(buyer["transport_mode"], normal_style), ""],
+        [Paragraph(f"<b>Driver Name:</b>", normal_style), Paragraph(buyer["driver_name"], normal_style), ""]]
+    buyer_table = Table(buyer_info_data, colWidths=[1.5*inch, 4.5*inch, 1.5*inch]); buyer_table.setStyle(template.buyer_table_style)
+    elements.append(buyer_table); elements.append(Spacer(1, 20))
+    items_data, amounts = [], []
+    for entry, item in zip(data.get("items", []), invoice.items):
+        desc, size, qty, rate = item.description, item.size, str(entry.get("qty", "")), str(entry.get("rate", ""))
+        if desc and qty and rate and item.amount > 0:
+            items_data.append([str(len(items_data) + 1), fit_text(desc, DESCRIPTION_TEXT_WIDTH), fit_text(size, SIZE_TEXT_WIDTH), qty, rate, f"{item.amount:.2f}"])
+            amounts.append(item.amount)
+    elements.append(ItemRowsFlowable(template, items_data, amounts)); elements.append(Spacer(1, 20))
+    totals_data = [['Total Amount (Before Tax):', f"{total_before_tax:.2f}"], [f'Add: {cgst_caption}:', f"{cgst:.2f}"], [f'Add: {sgst_caption}:', f"{sgst:.2f}"], [f'Add: {igst_caption}:', f"{igst:.2f}"], [Paragraph('<b>Grand Total:</b>', normal_style), Paragraph(f"<b>{grand_total:.2f}</b>", normal_style)]]
+    totals_table = Table(totals_data, colWidths=[6*inch, 1.5*inch]); totals_table.setStyle(template.totals_table_style); elements.append(totals_table); elements.append(Spacer(1, 10))
+    elements.append(Paragraph(f"<b>Amount in Words:</b> {grand_total_in_words}", normal_style)); elements.append(Spacer(1, 40))
+
+    # --- Use the profile name for the signature line ---
+    elements.append(Paragraph(template.signature_markup, normal_style))
+    elements.append(Spacer(1, 30)); elements.append(Paragraph("Authorised Signatory", normal_style))
+    doc.build(elements)
+    return pdf_path
@@ -0,0 +1,92 @@
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from instrumentation import metrics
+
+# --- Background PDF rendering for the GUI ---
+# Jobs run one at a time on a single worker thread (the cached PDF templates are
+# shared, so renders must not overlap). The Tk side only ever sees callbacks
+# delivered on its own thread, via a queue polled with after().
+
+POLL_MS = 50
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf-render")
+
+
+class PdfRenderCancelled(Exception):
+    pass
+
+
+class PdfRenderJob:
+    """Renders one invoice snapshot to pdf_path without blocking the Tk main loop.
+
+    With a cache (a pdf_cache.PdfCache) the PDF is taken from or rendered into the
+    cache instead, and pdf_path is set to the cached file. on_progress(fraction),
+    on_done(pdf_path) and on_error(exc) are called on the Tk thread. cancel() stops
+    a queued job outright and a running one at the next flowable, removing any
+    partially written file.
+    """
+
+    def __init__(self, widget, data, pdf_path=None, on_progress=None, on_done=None, on_error=None, cache=None):
+        self.widget, self.data, self.pdf_path, self.cache = widget, data, pdf_path, cache
+        self.on_progress, self.on_done, self.on_error = on_progress, on_done, on_error
+        self._events = queue.Queue()
+        self._cancelled = threading.Event()
+        self._future = None
+
+    def start(self):
+        self._future = _executor.submit(self._run)
+        self.widget.after(POLL_MS, self._poll)
+        return self
+
+    def cancel(self):
+        self._cancelled.set()
+        if self._future is not None and self._future.cancel():
+            self._events.put(("error", PdfRenderCancelled()))
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    # --- Worker thread ---
+    def _run(self):
+        from pdf_invoice import build_invoice_pdf
+        total = [1]
+
+        def progress(kind, value):
+            if self._cancelled.is_set():
+                raise PdfRenderCancelled()
+            if kind == "SIZE_EST":
+                total[0] = max(value, 1)
+            elif kind == "PROGRESS":
+                self._events.put(("progress", min(value / total[0], 1.0)))
+
+        try:
+            with metrics.span("pdf_render"):
+                if self.cache is not None:
+                    self.pdf_path = self.cache.render(self.data, progress=progress)
+                else:
+                    build_invoice_pdf(self.data, self.pdf_path, progress=progress)
+        except BaseException as exc:
+            if self.pdf_path and os.path.exists(self.pdf_path) and isinstance(exc, PdfRenderCancelled):
+                os.remove(self.pdf_path)
+            self._events.put(("error", exc))
+        else:
+            self._events.put(("done", self.pdf_path))
+
+    # --- Tk thread ---
+    def _poll(self):
+        finished = False
+        try:
+            while True:
+                kind, value = self._events.get_nowait()
+                if kind == "progress":
+                    if self.on_progress: self.on_progress(value)
+                else:
+                    finished = True
+                    callback = self.on_done if kind == "done" else self.on_error
+                    if callback: callback(value)
+        except queue.Empty:
+            pass
+        if not finished:
+            self.widget.after(POLL_MS, self._poll)
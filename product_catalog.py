@@ -0,0 +1,104 @@
+import csv
+import os
+from bisect import bisect_left
+from invoice_model import DEFAULT_GST_RATE, parse_gst_rate, parse_rate
+
+# --- Product catalog: product x size -> rate, HSN code and GST rate ---
+# Loaded from a CSV with the columns product,size,rate,hsn[,gst_rate]. Product names
+# are indexed for type-ahead: a sorted list for prefix search and a trigram index
+# for substring search, so lookups touch only candidate names, not the whole catalog.
+
+SEARCH_LIMIT = 50
+
+
+class CatalogEntry:
+    __slots__ = ("product", "size", "rate", "hsn", "gst_rate")
+
+    def __init__(self, product, size, rate, hsn="", gst_rate=DEFAULT_GST_RATE):
+        self.product, self.size, self.rate, self.hsn, self.gst_rate = product, size, rate, hsn, gst_rate
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class ProductCatalog:
+    def __init__(self, entries=()):
+        self._entries = {}
+        self._sizes = {}
+        self._names = {}
+        for entry in entries:
+            self.add(entry)
+        self._build_index()
+
+    def add(self, entry):
+        key = entry.product.casefold()
+        self._names.setdefault(key, entry.product)
+        if (key, entry.size) not in self._entries:
+            self._sizes.setdefault(key, []).append(entry.size)
+        self._entries[(key, entry.size)] = entry
+
+    def _build_index(self):
+        self._sorted_keys = sorted(self._names)
+        self._trigram_index = {}
+        for key in self._sorted_keys:
+            for gram in _trigrams(key):
+                self._trigram_index.setdefault(gram, []).append(key)
+
+    @classmethod
+    def from_csv(cls, path):
+        entries = []
+        with open(path, newline="", encoding="utf-8") as f:
+            for record in csv.DictReader(f):
+                product = (record.get("product") or "").strip()
+                if not product:
+                    continue
+                # Rates are auto-filled into invoice rows, so NaN, infinite or negative ones never get in
+                try:
+                    rate, gst_rate = parse_rate(record.get("rate")), parse_gst_rate(record.get("gst_rate"))
+                except ValueError:
+                    rate = None
+                if rate is None or rate < 0:
+                    print(f"Skipping catalog line with invalid rate: {record}")
+                    continue
+                entries.append(CatalogEntry(product, (record.get("size") or "").strip(), rate, (record.get("hsn") or "").strip(), gst_rate))
+        return cls(entries)
+
+    @classmethod
+    def load(cls, path, fallback_products=(), fallback_sizes=()):
+        """Catalog from path if it exists, otherwise the built-in product and size lists without rates."""
+        if path and os.path.exists(path):
+            return cls.from_csv(path)
+        return cls(CatalogEntry(product, size, None) for product in fallback_products for size in fallback_sizes)
+
+    def __len__(self):
+        return len(self._entries)
+
+    # --- Queries ---
+    def search(self, text, limit=SEARCH_LIMIT):
+        """Product names for type-ahead: prefix matches first (alphabetical), then substring matches."""
+        query = text.strip().casefold()
+        if not query:
+            return [self._names[key] for key in self._sorted_keys[:limit]]
+        results = []
+        start = bisect_left(self._sorted_keys, query)
+        for key in self._sorted_keys[start:]:
+            if not key.startswith(query) or len(results) >= limit:
+                break
+            results.append(key)
+        if len(results) < limit and len(query) >= 3:
+            grams = sorted(_trigrams(query), key=lambda gram: len(self._trigram_index.get(gram, ())))
+            seen = set(results)
+            for key in self._trigram_index.get(grams[0], ()):
+                if key not in seen and query in key:
+                    results.append(key)
+                    if len(results) >= limit:
+                        break
+        return [self._names[key] for key in results]
+
+    def sizes_for(self, product):
+        return self._sizes.get(product.strip().casefold(), [])
+
+    def lookup(self, product, size):
+        """The CatalogEntry for a product and size, or None; rate is None when the catalog has no price."""
+        return self._entries.get((product.strip().casefold(), size.strip()))
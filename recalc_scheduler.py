@@ -0,0 +1,42 @@
+from settings import RECALC_DEBOUNCE_MS
+
+
+class RecalcScheduler:
+    """Coalesces bursts of row edits into one recalculation pass on the Tk event loop.
+
+    Each edit (re)starts a debounce timer; when it fires, `recalculate` is called
+    once with every row edited since the last pass, in edit order.
+    """
+
+    def __init__(self, widget, recalculate, delay_ms=RECALC_DEBOUNCE_MS):
+        self.widget, self.recalculate, self.delay_ms = widget, recalculate, delay_ms
+        self._pending = {}
+        self._after_id = None
+
+    def schedule(self, row):
+        self._pending[id(row)] = row
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+        if self.delay_ms > 0:
+            self._after_id = self.widget.after(self.delay_ms, self.flush)
+        else:
+            self._after_id = self.widget.after_idle(self.flush)
+
+    def discard(self, row):
+        """Forgets a pending edit, e.g. because the row is being deleted."""
+        self._pending.pop(id(row), None)
+
+    def cancel(self):
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+        self._after_id = None
+        self._pending.clear()
+
+    def flush(self):
+        """Runs any pending recalculation now; call before reading totals."""
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        pending, self._pending = list(self._pending.values()), {}
+        if pending:
+            self.recalculate(pending)
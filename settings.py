@@ -0,0 +1,42 @@
+import os
+
+# --- Tunables, overridable per counter PC through environment variables ---
+
+# Quiet period after the last quantity/rate edit before totals are recomputed.
+# Raise it on slow machines so fast typing or pasting coalesces into one recompute;
+# 0 recomputes on the next idle cycle.
+RECALC_DEBOUNCE_MS = int(os.environ.get("BILLING_RECALC_DEBOUNCE_MS", "120"))
+
+# Where invoices, drafts and other local data are kept.
+DATA_DIR = os.environ.get("BILLING_DATA_DIR", os.path.join(os.path.expanduser("~"), "BillingApp"))
+
+# Invoice store. Billing counters sharing one folder point BILLING_STORE at the same
+# file there and set BILLING_STORE_SHARED=1: SQLite's WAL mode needs shared memory
+# that network filesystems don't provide, so a shared store uses a rollback journal
+# and file locks instead. Writers wait up to STORE_BUSY_TIMEOUT_S for each other.
+STORE_PATH = os.environ.get("BILLING_STORE", os.path.join(DATA_DIR, "invoices.db"))
+STORE_SHARED = os.environ.get("BILLING_STORE_SHARED", "0") != "0"
+STORE_BUSY_TIMEOUT_S = float(os.environ.get("BILLING_STORE_BUSY_TIMEOUT_S", "30"))
+
+# Import reportlab and build the default PDF template in the background once the
+# window is up, so the first "Generate PDF Invoice" click does not pay for it.
+PREWARM_PDF = os.environ.get("BILLING_PREWARM_PDF", "1") != "0"
+
+# Product catalog CSV (product,size,rate,hsn[,gst_rate]); without it the built-in
+# product and size lists are offered with no rates.
+CATALOG_PATH = os.environ.get("BILLING_CATALOG", os.path.join(DATA_DIR, "catalog.csv"))
+
+# Record latency histograms of the GUI hot paths (same as --instrument); see instrumentation.py.
+INSTRUMENT = os.environ.get("BILLING_INSTRUMENT", "0") != "0"
+
+# Crash-safe journal of the invoice being typed, replayed on the next start.
+# Edits are written (and fsynced) in batches every DRAFT_FLUSH_MS; the journal is
+# rewritten as a single snapshot once it holds DRAFT_COMPACT_OPS operations.
+DRAFT_PATH = os.environ.get("BILLING_DRAFT", os.path.join(DATA_DIR, "draft.journal"))
+DRAFT_FLUSH_MS = int(os.environ.get("BILLING_DRAFT_FLUSH_MS", "1000"))
+DRAFT_COMPACT_OPS = int(os.environ.get("BILLING_DRAFT_COMPACT_OPS", "2000"))
+
+# Rendered invoice PDFs, kept by content so reprints open instantly; the least
+# recently used are deleted once the cache exceeds PDF_CACHE_MAX_MB.
+PDF_CACHE_DIR = os.environ.get("BILLING_PDF_CACHE", os.path.join(DATA_DIR, "pdf-cache"))
+PDF_CACHE_MAX_MB = int(os.environ.get("BILLING_PDF_CACHE_MAX_MB", "500"))
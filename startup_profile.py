@@ -0,0 +1,35 @@
+import sys
+import time
+from contextlib import contextmanager
+
+# --- Startup profiling (python latestcode4 --profile-startup) ---
+
+
+class StartupProfiler:
+    """Times named startup phases; the report is only printed when enabled."""
+
+    def __init__(self):
+        self.enabled = "--profile-startup" in sys.argv
+        self.start = time.perf_counter()
+        self.phases = []
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def report(self, milestone="window shown", out=None):
+        if not self.enabled:
+            return
+        out = out or sys.stderr
+        elapsed = time.perf_counter() - self.start
+        print("--- Startup profile ---", file=out)
+        for name, seconds in self.phases:
+            print(f"{seconds * 1000:9.1f} ms  {name}", file=out)
+        print(f"{elapsed * 1000:9.1f} ms  total until {milestone}", file=out)
+
+
+profiler = StartupProfiler()